@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import time
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BatchWriter:
+    """Write-behind queue that groups inserts into `insert_many` calls.
+
+    Documents are accepted into a bounded queue and flushed when either
+    `max_batch` documents are waiting or `max_delay` seconds have passed since
+    the first one arrived. When the queue is full `submit` waits for space,
+    which pushes back on the request instead of growing memory.
+    """
+
+    def __init__(self, collection, max_batch: int = 100, max_delay: float = 0.5, max_queue: int = 10000):
+        self.collection = collection
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._task: Optional[asyncio.Task] = None
+        self._pending: List[dict] = []
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def submit(self, doc: dict) -> None:
+        await self._queue.put(doc)
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Flush everything still queued and stop the background task."""
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Timed out flushing %s, writing remainder directly", self.collection.name)
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._pending:
+            # Collected by the cancelled task but never written
+            batch, self._pending = self._pending, []
+            await self._write(batch)
+            self._done(batch)
+        while not self._queue.empty():
+            batch = self._drain(self.max_batch)
+            await self._write(batch)
+            self._done(batch)
+
+    def _drain(self, limit: int) -> List[dict]:
+        batch = []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    def _done(self, batch: List[dict]) -> None:
+        for _ in batch:
+            self._queue.task_done()
+
+    async def _run(self) -> None:
+        while True:
+            self._pending = batch = [await self._queue.get()]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._write(batch)
+            self._pending = []
+            self._done(batch)
+
+    async def _write(self, batch: List[dict]) -> None:
+        if not batch:
+            return
+        try:
+            await self.collection.insert_many(batch, ordered=False)
+        except Exception:
+            self.failed += len(batch)
+            logger.exception("Failed to write %d documents to %s", len(batch), self.collection.name)
+            return
+        self.written += len(batch)
+        self.batches += 1
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "batches": self.batches,
+            "failed": self.failed,
+        }
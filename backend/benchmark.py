@@ -0,0 +1,341 @@
+"""Load-test the API against a synthetic catalog and compare with a baseline.
+
+Examples:
+
+    python benchmark.py --mock --products 1000 --blogs 1000
+    python benchmark.py --products 100000 --save-baseline
+    python benchmark.py --base-url http://localhost:8001 --concurrency 50
+    python benchmark.py --serialization --products 10000 --blogs 1000
+
+By default the app is driven in-process through httpx's ASGI transport,
+against the Mongo from `.env` or, with `--mock`, mongomock-motor. The seeded
+database is dropped afterwards. With `--base-url` an already running server
+is benchmarked instead, and nothing is seeded. `--serialization` skips HTTP
+entirely and compares the validated and fast JSON encoding paths.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent
+DEFAULT_BASELINE = ROOT_DIR / 'benchmark_baseline.json'
+
+CATEGORIES = ["pickles", "vinegars", "jams", "sauces", "juices"]
+WORDS_EN = ["traditional", "natural", "organic", "homemade", "spicy", "sweet", "fresh", "authentic", "afghan", "mango", "lemon", "carrot"]
+WORDS_FA = ["سنتی", "طبیعی", "خانگی", "تند", "شیرین", "تازه", "اصیل", "افغانی", "انبه", "لیمو", "هویج", "ترشی"]
+WORDS_PS = ["دودیز", "طبیعي", "کورني", "تریخ", "خوږ", "تازه", "اصلي", "افغان", "امبه", "لیمو", "ګازرې", "اچار"]
+
+
+def _text(words, count):
+    return " ".join(random.choice(words) for _ in range(count))
+
+
+def make_product():
+    return {
+        "id": str(uuid.uuid4()),
+        "category": random.choice(CATEGORIES),
+        "name_en": _text(WORDS_EN, 3).title(),
+        "name_fa": _text(WORDS_FA, 3),
+        "name_ps": _text(WORDS_PS, 3),
+        "description_en": _text(WORDS_EN, 20),
+        "description_fa": _text(WORDS_FA, 20),
+        "description_ps": _text(WORDS_PS, 20),
+        "image_url": f"https://images.unsplash.com/photo-{random.randint(10**9, 10**10)}",
+        "featured": random.random() < 0.1,
+    }
+
+
+def make_blog(created_at):
+    return {
+        "id": str(uuid.uuid4()),
+        "title_en": _text(WORDS_EN, 6).title(),
+        "title_fa": _text(WORDS_FA, 6),
+        "title_ps": _text(WORDS_PS, 6),
+        "excerpt_en": _text(WORDS_EN, 25),
+        "excerpt_fa": _text(WORDS_FA, 25),
+        "excerpt_ps": _text(WORDS_PS, 25),
+        "content_en": _text(WORDS_EN, 400),
+        "content_fa": _text(WORDS_FA, 400),
+        "content_ps": _text(WORDS_PS, 400),
+        "image_url": f"https://images.pexels.com/photos/{random.randint(10**6, 10**7)}/photo.jpeg",
+        "created_at": created_at,
+    }
+
+
+def make_gallery_image():
+    return {
+        "id": str(uuid.uuid4()),
+        "image_url": f"https://images.unsplash.com/photo-{random.randint(10**9, 10**10)}",
+        "category": random.choice(CATEGORIES),
+        "alt_en": _text(WORDS_EN, 4),
+        "alt_fa": _text(WORDS_FA, 4),
+        "alt_ps": _text(WORDS_PS, 4),
+    }
+
+
+def make_faq():
+    return {
+        "id": str(uuid.uuid4()),
+        "question_en": _text(WORDS_EN, 8) + "?",
+        "question_fa": _text(WORDS_FA, 8) + "؟",
+        "question_ps": _text(WORDS_PS, 8) + "؟",
+        "answer_en": _text(WORDS_EN, 30),
+        "answer_fa": _text(WORDS_FA, 30),
+        "answer_ps": _text(WORDS_PS, 30),
+    }
+
+
+async def _insert(collection, docs, chunk=1000):
+    for start in range(0, len(docs), chunk):
+        await collection.insert_many(docs[start:start + chunk])
+
+
+async def seed(db, args):
+    now = datetime.now(timezone.utc)
+    await _insert(db.products, [make_product() for _ in range(args.products)])
+    await _insert(db.blogs, [make_blog(now - timedelta(minutes=i)) for i in range(args.blogs)])
+    await _insert(db.gallery, [make_gallery_image() for _ in range(args.gallery)])
+    await _insert(db.faqs, [make_faq() for _ in range(args.faqs)])
+
+
+def routes(sample):
+    """(name, method, path, body) for every /api route, using ids from `sample`."""
+    contact = {"name": "Bench", "email": "bench@example.com", "message": "Load test"}
+    inquiry = {**contact, "product_category": "pickles", "quantity": "10"}
+    product = {k: v for k, v in make_product().items() if k != "id"}
+    blog = {k: v for k, v in make_blog(datetime.now(timezone.utc)).items() if k not in ("id", "created_at")}
+    image = {k: v for k, v in make_gallery_image().items() if k != "id"}
+    return [
+        ("root", "GET", "/api/", None),
+        ("products", "GET", "/api/products", None),
+        ("products_category", "GET", "/api/products?category=pickles", None),
+        ("products_page", "GET", "/api/products?limit=20&lang=fa", None),
+        ("product", "GET", f"/api/products/{sample['product']}", None),
+        ("blogs", "GET", "/api/blogs", None),
+        ("blogs_cards", "GET", "/api/blogs?limit=3&fields=title,excerpt,image_url&lang=en", None),
+        ("blog", "GET", f"/api/blogs/{sample['blog']}", None),
+        ("gallery", "GET", "/api/gallery", None),
+        ("faqs", "GET", "/api/faqs", None),
+        ("home", "GET", "/api/home", None),
+        ("search", "GET", "/api/search?q=mango", None),
+        ("search_fa", "GET", "/api/search?q=%D8%AA%D8%B1%D8%B4%DB%8C", None),
+        ("cache_stats", "GET", "/api/cache/stats", None),
+        ("metrics", "GET", "/api/metrics", None),
+        ("contact", "POST", "/api/contact", contact),
+        ("inquiry", "POST", "/api/inquiry", inquiry),
+        ("create_product", "POST", "/api/products", product),
+        ("create_blog", "POST", "/api/blogs", blog),
+        ("create_gallery", "POST", "/api/gallery", image),
+        ("bulk_products", "POST", "/api/products/bulk", json.dumps(product)),
+    ]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def drive(http, method, path, body, requests, concurrency):
+    latencies = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            if isinstance(body, str):
+                response = await http.request(method, path, content=body)
+            else:
+                response = await http.request(method, path, json=body)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+    }
+
+
+def max_rss_mb():
+    # ru_maxrss is reported in kilobytes on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+async def run(args):
+    try:
+        import httpx
+    except ImportError:
+        sys.exit("benchmark.py needs httpx: pip install httpx")
+
+    selected = set(args.routes.split(",")) if args.routes else None
+    server = None
+    if args.base_url:
+        http = httpx.AsyncClient(base_url=args.base_url, timeout=30)
+        sample = {
+            "product": (await http.get("/api/products?limit=1")).json()[0]["id"],
+            "blog": (await http.get("/api/blogs?limit=1")).json()[0]["id"],
+        }
+    else:
+        os.environ.setdefault('SERVER_TIMING', 'false')
+        # Measure the submission write path rather than the spam guards
+        for name in ('SUBMISSION_IP_RATE_PER_MINUTE', 'SUBMISSION_EMAIL_RATE_PER_MINUTE', 'SUBMISSION_DEDUP_WINDOW'):
+            os.environ.setdefault(name, '0')
+        import server
+        if args.mock:
+            try:
+                from mongomock_motor import AsyncMongoMockClient
+            except ImportError:
+                sys.exit("--mock needs mongomock-motor: pip install mongomock-motor")
+            server.client = AsyncMongoMockClient()
+        server.db = server.client[f"benchmark_{uuid.uuid4().hex[:8]}"]
+        print(f"Seeding {args.products} products, {args.blogs} blogs, {args.gallery} images, {args.faqs} FAQs...")
+        await seed(server.db, args)
+        await server.app.router.startup()
+        http = httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url="http://bench", timeout=30)
+        sample = {
+            "product": (await server.db.products.find_one({}, {"id": 1}))["id"],
+            "blog": (await server.db.blogs.find_one({}, {"id": 1}))["id"],
+        }
+
+    results = {}
+    try:
+        for name, method, path, body in routes(sample):
+            if selected and name not in selected:
+                continue
+            if args.warmup:
+                await drive(http, method, path, body, args.warmup, min(args.concurrency, args.warmup))
+            results[name] = await drive(http, method, path, body, args.requests, args.concurrency)
+            row = results[name]
+            print(f"{name:<18} {row['rps']:>9.1f} rps  p50 {row['p50_ms']:>8.2f}  p95 {row['p95_ms']:>8.2f}  "
+                  f"p99 {row['p99_ms']:>8.2f} ms  errors {row['errors']}")
+    finally:
+        await http.aclose()
+        if server is not None:
+            await server.client.drop_database(server.db.name)
+            await server.app.router.shutdown()
+
+    return {
+        "config": {
+            "products": args.products, "blogs": args.blogs, "gallery": args.gallery, "faqs": args.faqs,
+            "requests": args.requests, "concurrency": args.concurrency,
+            "backend": args.base_url or ("mongomock" if args.mock else "mongo"),
+        },
+        "max_rss_mb": max_rss_mb(),
+        "routes": results,
+    }
+
+
+def compare_serialization(args):
+    """Time validated (pydantic) vs fast (orjson) encoding of list responses."""
+    import server
+    from serialization import list_json, orjson
+
+    if orjson is None:
+        sys.exit("--serialization needs orjson: pip install orjson")
+    now = datetime.now(timezone.utc)
+    blogs = [make_blog(now - timedelta(minutes=i)) for i in range(args.blogs)]
+    datasets = [
+        ("products", server.Product, [make_product() for _ in range(args.products)]),
+        ("blogs", server.Blog, blogs),
+    ]
+    for name, model, docs in datasets:
+        if not docs:
+            continue
+        assert json.loads(list_json(model, docs)) == json.loads(list_json(model, docs, fast=True))
+        timings = {}
+        for label, fast in (("validated", False), ("fast", True)):
+            runs = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                list_json(model, docs, fast=fast)
+                runs.append(time.perf_counter() - started)
+            timings[label] = statistics.median(runs) * 1000
+        print(f"{name:<9} {len(docs):>7} docs  validated {timings['validated']:>9.2f} ms  "
+              f"fast {timings['fast']:>8.2f} ms  speedup {timings['validated'] / timings['fast']:.1f}x")
+
+
+def compare(report, baseline, tolerance):
+    """Return a list of regressions of `report` against `baseline`."""
+    if baseline.get("config") != report["config"]:
+        print("warning: baseline was recorded with a different configuration")
+    regressions = []
+    for name, current in report["routes"].items():
+        previous = baseline.get("routes", {}).get(name)
+        if previous is None:
+            continue
+        if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {previous['p95_ms']}ms -> {current['p95_ms']}ms")
+        if current["rps"] < previous["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: rps {previous['rps']} -> {current['rps']}")
+    previous_rss = baseline.get("max_rss_mb")
+    if previous_rss and report["max_rss_mb"] > previous_rss * (1 + tolerance):
+        regressions.append(f"max RSS {previous_rss}MB -> {report['max_rss_mb']}MB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--blogs", type=int, default=1000)
+    parser.add_argument("--gallery", type=int, default=100)
+    parser.add_argument("--faqs", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=200, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=10, help="untimed requests per route")
+    parser.add_argument("--routes", help="comma separated route names to run (default: all)")
+    parser.add_argument("--mock", action="store_true", help="use mongomock-motor instead of MONGO_URL")
+    parser.add_argument("--base-url", help="benchmark a running server instead of the in-process app")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument("--seed", type=int, default=1234, help="random seed for the synthetic catalog")
+    parser.add_argument("--serialization", action="store_true", help="compare JSON encoding paths only")
+    parser.add_argument("--repeat", type=int, default=20, help="repetitions per encoding path")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    if args.serialization:
+        compare_serialization(args)
+        return
+    report = asyncio.run(run(args))
+    print(f"max RSS {report['max_rss_mb']} MB")
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f"Saved baseline to {args.baseline}")
+        return
+    if args.baseline.exists():
+        regressions = compare(report, json.loads(args.baseline.read_text()), args.tolerance)
+        if regressions:
+            print("Regressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import json
+from typing import AsyncIterator, Callable, List, Optional, Tuple
+
+from pydantic import ValidationError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+BULK_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 100
+MAX_LINE_BYTES = 1024 * 1024
+
+
+async def iter_ndjson(
+    chunks: AsyncIterator[bytes], max_line_bytes: int = MAX_LINE_BYTES
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """Yield `(line_number, line)` for each non-blank line of an NDJSON stream.
+
+    Lines longer than `max_line_bytes` are skipped without being buffered and
+    yielded as `(line_number, None)`.
+    """
+    buffer = bytearray()
+    oversized = False
+    line_number = 0
+    async for chunk in chunks:
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            piece = chunk[start:] if end < 0 else chunk[start:end]
+            if not oversized:
+                if len(buffer) + len(piece) > max_line_bytes:
+                    oversized = True
+                    buffer.clear()
+                else:
+                    buffer += piece
+            if end < 0:
+                break
+            line_number += 1
+            if oversized:
+                yield line_number, None
+            elif buffer.strip():
+                yield line_number, bytes(buffer)
+            buffer.clear()
+            oversized = False
+            start = end + 1
+    if oversized:
+        yield line_number + 1, None
+    elif buffer.strip():
+        yield line_number + 1, bytes(buffer)
+
+
+async def bulk_upsert(
+    collection,
+    chunks: AsyncIterator[bytes],
+    build: Callable[[dict], Tuple[dict, dict]],
+    batch_size: int = BULK_BATCH_SIZE,
+    on_written: Optional[Callable[[List[dict]], None]] = None,
+) -> dict:
+    """Validate NDJSON items one by one and upsert them by `id` in batches.
+
+    `build` turns a decoded item into `(fields_to_set, fields_on_insert)`; it
+    raises `ValidationError` for invalid items, which are reported per line
+    without aborting the import. `on_written` receives the validated
+    documents of each batch once it has been written.
+    """
+    summary = {"received": 0, "upserted": 0, "modified": 0, "matched": 0, "errors": []}
+    batch: List[UpdateOne] = []
+    docs: List[dict] = []
+    line_numbers: List[int] = []
+
+    async def flush():
+        if not batch:
+            return
+        written = list(docs)
+        try:
+            result = await collection.bulk_write(batch, ordered=False)
+        except BulkWriteError as exc:
+            # Unordered, so the other operations of the batch were still applied
+            details = exc.details
+            summary["upserted"] += details.get("nUpserted", 0)
+            summary["modified"] += details.get("nModified", 0)
+            summary["matched"] += details.get("nMatched", 0)
+            failed = set()
+            for error in details.get("writeErrors", []):
+                failed.add(error["index"])
+                report(line_numbers[error["index"]], error.get("errmsg", "write failed"))
+            written = [doc for i, doc in enumerate(docs) if i not in failed]
+        else:
+            summary["upserted"] += result.upserted_count
+            summary["modified"] += result.modified_count
+            summary["matched"] += result.matched_count
+        if on_written is not None and written:
+            on_written(written)
+        batch.clear()
+        docs.clear()
+        line_numbers.clear()
+
+    def report(line_number: int, error: str):
+        if len(summary["errors"]) < MAX_REPORTED_ERRORS:
+            summary["errors"].append({"line": line_number, "error": error})
+
+    async for line_number, line in iter_ndjson(chunks):
+        summary["received"] += 1
+        if line is None:
+            report(line_number, f"line exceeds {MAX_LINE_BYTES} bytes")
+            continue
+        try:
+            item = json.loads(line)
+            if not isinstance(item, dict):
+                raise ValueError("expected a JSON object")
+            doc, on_insert = build(item)
+        except ValidationError as exc:
+            report(line_number, "; ".join(
+                f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in exc.errors()
+            ))
+            continue
+        except ValueError as exc:
+            report(line_number, str(exc))
+            continue
+        update = {"$set": doc}
+        if on_insert:
+            update["$setOnInsert"] = on_insert
+        batch.append(UpdateOne({"id": doc["id"]}, update, upsert=True))
+        docs.append(doc)
+        line_numbers.append(line_number)
+        if len(batch) >= batch_size:
+            await flush()
+    await flush()
+    summary["failed"] = summary["received"] - summary["upserted"] - summary["matched"]
+    return summary
@@ -0,0 +1,164 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from compression import compress
+
+
+class CachedPayload:
+    """A pre-serialized response body together with its content-hash ETag.
+
+    Compressed variants are produced on first request for each encoding and
+    kept on the payload, so a cached entry is compressed at most once per
+    encoding rather than once per response.
+    """
+
+    __slots__ = ("body", "etag", "media_type", "headers", "_encoded")
+
+    def __init__(self, body: bytes, media_type: str = "application/json", headers: Optional[dict] = None):
+        self.body = body
+        self.etag = '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+        self.media_type = media_type
+        self.headers = headers or {}
+        self._encoded: Dict[str, bytes] = {}
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.body) + sum(len(body) for body in self._encoded.values())
+
+    def has_encoding(self, encoding: Optional[str]) -> bool:
+        return encoding is None or encoding in self._encoded
+
+    def encoded(self, encoding: Optional[str]) -> bytes:
+        """Body in the given content coding; compressing it is blocking on first use."""
+        if encoding is None:
+            return self.body
+        body = self._encoded.get(encoding)
+        if body is None:
+            body = self._encoded[encoding] = compress(self.body, encoding)
+        return body
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        """Distinct strong ETag per content coding, as each is its own representation."""
+        return self.etag if encoding is None else '%s-%s"' % (self.etag[:-1], encoding)
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Return True if an If-None-Match header value matches this ETag."""
+        if not if_none_match:
+            return False
+        for candidate in if_none_match.split(","):
+            candidate = candidate.strip()
+            if candidate == "*":
+                return True
+            if candidate.startswith("W/"):
+                candidate = candidate[2:]
+            if candidate == self.etag or candidate.startswith(self.etag[:-1] + "-"):
+                return True
+        return False
+
+
+class ResponseCache:
+    """In-process TTL/LRU cache for read-only catalog responses.
+
+    Entries are keyed by route name plus the query parameters that shape the
+    response, so `("products", (("category", "pickles"),))` and
+    `("products", ())` are cached independently and can be invalidated
+    together by route.
+
+    Since clients choose those parameters, the cache is bounded by the total
+    size of its payloads (`nbytes`, compressed variants included) as well as
+    by entry count.
+
+    Each route has a generation that `invalidate` bumps. A caller that loads
+    a value records `generation(route)` first and passes it to `set`, which
+    drops the value if the route was invalidated while it was loading.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._cleared = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(route: str, **params) -> Tuple[str, Hashable]:
+        return route, tuple(sorted((k, v) for k, v in params.items() if v is not None))
+
+    def get(self, key: Tuple[str, Hashable]) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    @staticmethod
+    def _size(value: Any) -> int:
+        return getattr(value, "nbytes", 0)
+
+    def generation(self, route: str) -> int:
+        return self._cleared + self._generations.get(route, 0)
+
+    def set(self, key: Tuple[str, Hashable], value: Any, generation: Optional[int] = None) -> None:
+        if generation is not None and generation != self.generation(key[0]):
+            return
+        if self.max_entries <= 0 or self._size(value) > self.max_bytes:
+            self._entries.pop(key, None)
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        self.trim()
+
+    def nbytes(self) -> int:
+        return sum(self._size(value) for _, value in self._entries.values())
+
+    def trim(self) -> None:
+        """Evict least recently used entries until both bounds hold again.
+
+        Call after a cached value has grown, e.g. gained a compressed body.
+        """
+        total = self.nbytes()
+        while self._entries and (len(self._entries) > self.max_entries or total > self.max_bytes):
+            _, (_, value) = self._entries.popitem(last=False)
+            total -= self._size(value)
+            self.evictions += 1
+
+    def invalidate(self, *routes: str) -> int:
+        """Drop every entry for the given routes (all entries if none given)."""
+        if not routes:
+            self._cleared += 1
+            removed = len(self._entries)
+            self._entries.clear()
+            return removed
+        for route in routes:
+            self._generations[route] = self._generations.get(route, 0) + 1
+        stale = [key for key in self._entries if key[0] in routes]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self.nbytes(),
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
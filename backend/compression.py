@@ -0,0 +1,156 @@
+import asyncio
+import zlib
+from typing import Callable, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+# Server preference when the client weights several encodings equally
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+COMPRESSIBLE_TYPES = ("application/json", "application/javascript", "application/xml", "image/svg+xml")
+
+# Levels for bodies compressed once and cached, and for per-response
+# compression. On the 11.9 MB list of 1000 benchmark blogs, br 5 takes 0.33 s
+# for 1.5 MB and gzip 6 0.53 s for 1.3 MB; br 9 / gzip 9 take 1.0 s / 1.3 s
+# for barely smaller output.
+CACHED_LEVELS = {"br": 5, "gzip": 6}
+STREAM_LEVELS = {"br": 4, "gzip": 6}
+
+# Bodies at least this large are compressed in a worker thread rather than on
+# the event loop.
+THREAD_MIN_SIZE = 256 * 1024
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the best supported encoding from an Accept-Encoding header, or None."""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            weights[name] = q
+    best, best_q = None, 0.0
+    for encoding in ENCODINGS:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compressible(media_type: Optional[str]) -> bool:
+    media_type = (media_type or "").split(";")[0].strip().lower()
+    return (
+        media_type.startswith("text/") or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith("+json") or media_type.endswith("+xml")
+    )
+
+
+def compressor(encoding: str, level: int) -> Tuple[Callable[[bytes], bytes], Callable[[], bytes]]:
+    """Incremental compressor as a (compress, finish) pair."""
+    if encoding == "br":
+        stream = brotli.Compressor(quality=level)
+        return stream.process, stream.finish
+    stream = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return stream.compress, stream.flush
+
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    compress_chunk, finish = compressor(encoding, CACHED_LEVELS[encoding] if level is None else level)
+    return compress_chunk(body) + finish()
+
+
+def _compress_all(compress_chunk, finish, body: bytes) -> bytes:
+    return compress_chunk(body) + finish()
+
+
+class CompressionMiddleware:
+    """gzip/brotli response compression negotiated from Accept-Encoding.
+
+    Responses that already carry a Content-Encoding (such as cached catalog
+    payloads, which keep their compressed bodies) pass through untouched, as
+    do bodies below `minimum_size` and non-text media types.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        start_message = None
+        compress_chunk = finish = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, compress_chunk, finish, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compress_chunk is None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                if (
+                    start_message["status"] < 200 or start_message["status"] in (204, 206, 304)
+                    or "content-encoding" in headers or not compressible(headers.get("content-type"))
+                    or (not more_body and len(body) < self.minimum_size)
+                ):
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                if "accept-encoding" not in headers.get("vary", "").lower():
+                    headers.add_vary_header("Accept-Encoding")
+                if encoding is None:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                compress_chunk, finish = compressor(encoding, STREAM_LEVELS[encoding])
+                headers["Content-Encoding"] = encoding
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = "W/" + etag
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    if len(body) >= THREAD_MIN_SIZE:
+                        body = await asyncio.to_thread(_compress_all, compress_chunk, finish, body)
+                    else:
+                        body = compress_chunk(body) + finish()
+                    headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(start_message)
+
+            if len(body) >= THREAD_MIN_SIZE:
+                chunk = await asyncio.to_thread(compress_chunk, body)
+            else:
+                chunk = compress_chunk(body)
+            if not more_body:
+                chunk += finish()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,333 @@
+"""Export static JSON snapshots of the catalog read endpoints.
+
+Every list endpoint is rendered per language and per category, and so is
+every product and blog. Each file is written alongside `.gz` and `.br`
+precompressed copies, so nginx (gzip_static/brotli_static) or a CDN can serve
+reads without reaching the API:
+
+    products.json            /api/products
+    products.fa.json         /api/products?lang=fa
+    products/category/pickles.json
+    products/<id>.ps.json    /api/products/<id>?lang=ps
+    blogs.json, blogs/<id>.json, gallery.json, gallery/category/<c>.json,
+    faqs.json, home.json
+
+The category and item files are cut from the full lists, which are read
+MAX_PAGE_SIZE items per request by following the next-page cursor.
+
+    python export_snapshots.py [output_dir]
+
+Inside the API only one process per SNAPSHOT_DIR exports: the worker holding
+the directory's lock file. Writes handled by any worker mark the changed
+sections dirty and the exporting worker re-exports only those.
+"""
+import asyncio
+import gzip
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import quote, urlencode
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+from compression import brotli
+from i18n import LANGUAGES
+from pagination import MAX_PAGE_SIZE
+from serialization import dump_json
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).parent
+# None renders the full multilingual documents, next to one file per language
+SNAPSHOT_LANGUAGES = (None,) + LANGUAGES
+
+# Snapshot sections, named like the cache routes passed to catalog_changed()
+SECTIONS = ("products", "gallery", "blogs", "faqs", "home")
+CATEGORIZED = ("products", "gallery")
+DETAILED = ("products", "blogs")
+
+# The one-off CLI export can afford maximum brotli; the automatic re-export
+# after writes uses a quality that stays fast on large lists.
+CLI_BROTLI_QUALITY = 11
+BACKGROUND_BROTLI_QUALITY = 5
+
+
+async def asgi_get(app, path: str, params: Optional[dict] = None) -> Tuple[int, dict, bytes]:
+    """Issue a GET against the ASGI app in-process and return (status, headers, body)."""
+    query = urlencode({k: v for k, v in (params or {}).items() if v is not None})
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "server": ("snapshot", 80), "client": ("127.0.0.1", 0),
+        "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": query.encode(), "headers": [(b"host", b"snapshot")],
+    }
+    status = 500
+    headers = {}
+    body = bytearray()
+    request_sent = False
+    response_done = asyncio.Event()
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await response_done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            headers.update((k.decode("latin-1").lower(), v.decode("latin-1")) for k, v in message.get("headers", []))
+        elif message["type"] == "http.response.body":
+            body.extend(message.get("body", b""))
+            if not message.get("more_body", False):
+                response_done.set()
+
+    await app(scope, receive, send)
+    return status, headers, bytes(body)
+
+
+async def fetch_all(app, path: str, params: Optional[dict] = None) -> Optional[List[dict]]:
+    """Fetch every page of a list endpoint by following X-Next-Cursor."""
+    items: List[dict] = []
+    cursor = None
+    while True:
+        status, headers, body = await asgi_get(app, path, {**(params or {}), "limit": MAX_PAGE_SIZE, "cursor": cursor})
+        if status != 200:
+            logger.warning("Snapshot %s returned %d, skipped", path, status)
+            return None
+        items += await asyncio.to_thread(json.loads, body)
+        cursor = headers.get("x-next-cursor")
+        if not cursor:
+            return items
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def write_snapshot(out_dir: Path, name: str, body: bytes, brotli_quality: int = CLI_BROTLI_QUALITY) -> List[Path]:
+    """Write `name` plus its precompressed variants; returns the files written.
+
+    Blocking: compresses and writes files. Unchanged snapshots are left as
+    they are, so a re-export only recompresses what actually changed.
+    """
+    path = out_dir / name
+    written = [path, path.with_name(path.name + ".gz")]
+    if brotli is not None:
+        written.append(path.with_name(path.name + ".br"))
+    try:
+        unchanged = path.read_bytes() == body and all(p.exists() for p in written[1:])
+    except FileNotFoundError:
+        unchanged = False
+    if unchanged:
+        return written
+    _write_atomic(written[1], gzip.compress(body, compresslevel=9, mtime=0))
+    if brotli is not None:
+        _write_atomic(written[2], brotli.compress(body, quality=brotli_quality))
+    # The plain file goes last so it only matches once its variants are current
+    _write_atomic(path, body)
+    return written
+
+
+def _name(base: str, lang: Optional[str]) -> str:
+    return f"{base}.{lang}.json" if lang else f"{base}.json"
+
+
+def render_list(section: str, lang: Optional[str], items: List[dict]) -> List[Tuple[str, bytes]]:
+    """Split a full list into its snapshot files: the list, per category and per item."""
+    files = [(_name(section, lang), dump_json(items))]
+    if section in CATEGORIZED:
+        by_category: Dict[str, List[dict]] = {}
+        for item in items:
+            by_category.setdefault(item["category"], []).append(item)
+        for category, members in by_category.items():
+            files.append((_name(f"{section}/category/{quote(category, safe='')}", lang), dump_json(members)))
+    if section in DETAILED:
+        for item in items:
+            files.append((_name(f"{section}/{quote(item['id'], safe='')}", lang), dump_json(item)))
+    return files
+
+
+def _write_all(out_dir: Path, files: List[Tuple[str, bytes]], brotli_quality: int) -> List[Path]:
+    written = []
+    for name, body in files:
+        written += write_snapshot(out_dir, name, body, brotli_quality)
+    return written
+
+
+async def export(app, out_dir: Path, brotli_quality: int = CLI_BROTLI_QUALITY,
+                 sections: Optional[Iterable[str]] = None) -> int:
+    """Render the snapshots of `sections` (default: all) into `out_dir`; returns the file count.
+
+    Each list is read a full page at a time and the category and item files
+    are cut from it, so an export costs one request per MAX_PAGE_SIZE items
+    rather than one per item. Stale files of the exported sections are
+    removed. Compression and file IO run in a worker thread, so the event
+    loop keeps serving requests while an export is in progress.
+    """
+    out_dir = Path(out_dir)
+    sections = set(SECTIONS if sections is None else sections)
+    written: Set[Path] = set()
+    for section in SECTIONS:
+        if section not in sections:
+            continue
+        for lang in SNAPSHOT_LANGUAGES:
+            if section == "home":
+                status, _, body = await asgi_get(app, "/api/home", {"lang": lang})
+                if status != 200:
+                    logger.warning("Snapshot /api/home returned %d, skipped", status)
+                    continue
+                files = [(_name("home", lang), body)]
+            else:
+                items = await fetch_all(app, f"/api/{section}", {"lang": lang})
+                if items is None:
+                    continue
+                files = await asyncio.to_thread(render_list, section, lang, items)
+            written.update(await asyncio.to_thread(_write_all, out_dir, files, brotli_quality))
+
+    await asyncio.to_thread(_remove_stale, out_dir, written, sections)
+    return len(written)
+
+
+def _section(out_dir: Path, path: Path) -> str:
+    # products.fa.json, products/category/x.json and products/<id>.json all belong to "products"
+    return path.relative_to(out_dir).parts[0].split(".")[0]
+
+
+def _remove_stale(out_dir: Path, written: Set[Path], sections: Set[str]) -> None:
+    for path in _existing(out_dir):
+        if path not in written and _section(out_dir, path) in sections:
+            path.unlink()
+
+
+def _existing(out_dir: Path) -> Iterable[Path]:
+    if not out_dir.exists():
+        return []
+    return [p for p in out_dir.rglob("*") if p.is_file() and p.name.endswith((".json", ".json.gz", ".json.br"))]
+
+
+class SnapshotExporter:
+    """Debounced background re-export, triggered after catalog writes.
+
+    Every worker records writes by touching a per-section marker file in
+    `out_dir`; only the worker that holds the directory lock exports, polling
+    the markers and re-rendering just the sections that changed.
+    """
+
+    LOCK_NAME = ".export.lock"
+    DIRTY_NAME = ".export.{}.dirty"
+
+    def __init__(self, app, out_dir: Path, delay: float = 2.0,
+                 brotli_quality: int = BACKGROUND_BROTLI_QUALITY):
+        self.app = app
+        self.out_dir = Path(out_dir)
+        self.delay = delay
+        self.brotli_quality = brotli_quality
+        self._task: Optional[asyncio.Task] = None
+        self._lock_file = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._exported_at: Dict[str, float] = {}
+
+    @property
+    def leader(self) -> bool:
+        return self._lock_file is not None
+
+    def start(self) -> None:
+        """Become the exporting process if no other process already is."""
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        lock_file = open(self.out_dir / self.LOCK_NAME, "a")
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                return
+        self._lock_file = lock_file
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        logger.info("Exporting snapshots to %s from process %d", self.out_dir, os.getpid())
+
+    def schedule(self, *sections: str) -> None:
+        """Mark `sections` (default: all) for re-export."""
+        for section in sections or SECTIONS:
+            if section not in SECTIONS:
+                continue
+            try:
+                (self.out_dir / self.DIRTY_NAME.format(section)).touch()
+            except OSError:
+                logger.exception("Could not mark snapshot section %s dirty", section)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def dirty_sections(self) -> List[str]:
+        dirty = []
+        for section in SECTIONS:
+            try:
+                mtime = (self.out_dir / self.DIRTY_NAME.format(section)).stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if mtime >= self._exported_at.get(section, 0.0):
+                dirty.append(section)
+        return dirty
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if not self.dirty_sections():
+                continue
+            # Let a burst of writes settle before rendering
+            await asyncio.sleep(self.delay)
+            sections = self.dirty_sections()
+            now = time.time()
+            for section in sections:
+                self._exported_at[section] = now
+            try:
+                count = await export(self.app, self.out_dir, self.brotli_quality, sections)
+                logger.info("Exported %d snapshot files for %s to %s", count, ", ".join(sections), self.out_dir)
+            except Exception:
+                logger.exception("Snapshot export failed")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+
+async def main(out_dir: Path):
+    import server
+
+    print(f"Exporting snapshots to {out_dir}...")
+    if brotli is None:
+        print("! brotli is not installed, skipping .br files")
+    count = await export(server.app, out_dir)
+    print(f"✅ Exported {count} files")
+    server.client.close()
+
+
+if __name__ == "__main__":
+    target = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(os.environ.get('SNAPSHOT_DIR', ROOT_DIR / 'snapshots'))
+    asyncio.run(main(target))
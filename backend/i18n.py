@@ -0,0 +1,103 @@
+from typing import Dict, Iterable, List, Optional, Type
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ConfigDict, create_model
+
+LANGUAGES = ("en", "fa", "ps")
+DEFAULT_LANGUAGE = "en"
+
+_localized_models: Dict[Type[BaseModel], Type[BaseModel]] = {}
+
+
+def split_field(name: str):
+    """Return `(base, lang)` for a translated field name, else `(name, None)`."""
+    base, _, suffix = name.rpartition("_")
+    if base and suffix in LANGUAGES:
+        return base, suffix
+    return name, None
+
+
+def negotiate_language(lang: Optional[str], accept_language: Optional[str]) -> Optional[str]:
+    """Resolve the `lang` query parameter.
+
+    No `lang` keeps the full multilingual response. `lang=auto` picks the best
+    match from the Accept-Language header, falling back to English.
+    """
+    if lang is None:
+        return None
+    lang = lang.lower()
+    if lang in LANGUAGES:
+        return lang
+    if lang != "auto":
+        raise HTTPException(status_code=400, detail=f"Unsupported language: {lang}")
+
+    best, best_q = DEFAULT_LANGUAGE, 0.0
+    for part in (accept_language or "").split(","):
+        tag, _, params = part.strip().partition(";")
+        primary = tag.strip().lower().split("-")[0]
+        if primary not in LANGUAGES:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                continue
+        if q > best_q:
+            best, best_q = primary, q
+    return best
+
+
+def localized_model(model: Type[BaseModel]) -> Type[BaseModel]:
+    """Build (once) the compact single-language schema for `model`.
+
+    `name_en`/`name_fa`/`name_ps` collapse into `name`; untranslated fields
+    are kept as they are.
+    """
+    compact = _localized_models.get(model)
+    if compact is not None:
+        return compact
+    definitions = {}
+    for name, field in model.model_fields.items():
+        base, lang = split_field(name)
+        if lang is not None and lang != DEFAULT_LANGUAGE:
+            continue
+        definitions[base] = (field.annotation, None if lang else field)
+    compact = create_model(
+        f"{model.__name__}Localized",
+        __config__=ConfigDict(extra="ignore"),
+        **definitions,
+    )
+    _localized_models[model] = compact
+    return compact
+
+
+def storage_fields(model: Type[BaseModel], lang: Optional[str], fields: Optional[Iterable[str]] = None) -> List[str]:
+    """Map compact field names to the stored per-language names for a projection.
+
+    With `lang=None` a translated name expands to all of its languages.
+    """
+    names = fields if fields is not None else localized_model(model).model_fields
+    translated = {split_field(name)[0] for name in model.model_fields if split_field(name)[1]}
+    stored = []
+    for name in names:
+        if name not in translated:
+            stored.append(name)
+        elif lang is None:
+            stored.extend(f"{name}_{code}" for code in LANGUAGES)
+        else:
+            stored.append(f"{name}_{lang}")
+    return stored
+
+
+def localize(doc: dict, lang: str) -> dict:
+    """Rename the `*_<lang>` keys of a projected document to their base names."""
+    localized = {}
+    for key, value in doc.items():
+        base, key_lang = split_field(key)
+        if key_lang is None:
+            localized[key] = value
+        elif key_lang == lang:
+            localized[base] = value
+    return localized
@@ -0,0 +1,252 @@
+import asyncio
+import hashlib
+import io
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+import requests
+from fastapi import HTTPException
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # pragma: no cover - Pillow is optional at import time
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# Widths a variant can be requested at; anything else would let clients fill
+# the cache with arbitrary sizes. SRCSET_WIDTHS must match the widths the
+# frontend's imageSrcSet() (lib/utils.js) requests, which warm() precomputes.
+IMAGE_WIDTHS = (160, 320, 480, 640, 960, 1280, 1920)
+SRCSET_WIDTHS = (320, 640, 960, 1280)
+
+FORMATS = {
+    "jpeg": ("JPEG", "image/jpeg", {"quality": 82, "optimize": True, "progressive": True}),
+    "webp": ("WEBP", "image/webp", {"quality": 80, "method": 4}),
+    "avif": ("AVIF", "image/avif", {"quality": 60}),
+}
+
+MAX_ORIGINAL_BYTES = 20 * 1024 * 1024
+MAX_REDIRECTS = 3
+
+
+def format_available(fmt: str) -> bool:
+    if Image is None:
+        return False
+    return fmt == "jpeg" or bool(features.check(fmt))
+
+
+def negotiate_format(fmt: str, accept: Optional[str]) -> str:
+    """Resolve `fmt=auto` to the best format the client advertises in Accept."""
+    if fmt != "auto":
+        if fmt not in FORMATS:
+            raise HTTPException(status_code=400, detail=f"Unsupported format: {fmt}")
+        if not format_available(fmt):
+            raise HTTPException(status_code=501, detail=f"{fmt} encoding is not available")
+        return fmt
+    accept = accept or ""
+    for candidate in ("avif", "webp"):
+        if f"image/{candidate}" in accept and format_available(candidate):
+            return candidate
+    return "jpeg"
+
+
+class DiskLRUCache:
+    """Size-bounded directory of cached files, evicting least recently used.
+
+    Recency is tracked through file mtimes, so it survives restarts and is
+    shared by every worker using the same directory. Each worker only sees
+    its own writes between scans, so before evicting, and at least every
+    RESCAN_SECONDS, it rescans the directory. The bound therefore holds for
+    the directory as a whole, give or take what the other workers wrote since
+    the last scan.
+    """
+
+    RESCAN_SECONDS = 30.0
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._sizes: Dict[str, int] = {}
+        self.total_bytes = 0
+        self._scanned_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self._scan()
+
+    def _scan(self) -> List[Tuple[float, str]]:
+        """Re-read sizes from the directory; returns `(mtime, name)` per file."""
+        entries = []
+        sizes = {}
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".tmp"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if entry.is_file():
+                    sizes[entry.name] = stat.st_size
+                    entries.append((stat.st_mtime, entry.name))
+        self._sizes = sizes
+        self.total_bytes = sum(sizes.values())
+        self._scanned_at = time.monotonic()
+        return entries
+
+    def path(self, key: str) -> Path:
+        return self.directory / key
+
+    def get(self, key: str) -> Optional[Path]:
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self.total_bytes -= self._sizes.pop(key, 0)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def put(self, key: str, data: bytes) -> Path:
+        path = self.path(key)
+        tmp = path.with_name(f"{key}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        self.total_bytes += len(data) - self._sizes.get(key, 0)
+        self._sizes[key] = len(data)
+        if self.total_bytes > self.max_bytes or time.monotonic() - self._scanned_at > self.RESCAN_SECONDS:
+            self._evict()
+        return path
+
+    def _evict(self) -> None:
+        entries = self._scan()
+        if self.total_bytes <= self.max_bytes:
+            return
+        for _, name in sorted(entries):
+            if self.total_bytes <= self.max_bytes * 0.9:
+                break
+            try:
+                self.path(name).unlink()
+            except FileNotFoundError:
+                pass
+            self.total_bytes -= self._sizes.pop(name)
+
+    def stats(self) -> dict:
+        return {
+            "files": len(self._sizes),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def _resize(original: bytes, width: int, fmt: str) -> bytes:
+    pil_format, _, options = FORMATS[fmt]
+    with Image.open(io.BytesIO(original)) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.width > width:
+            image.thumbnail((width, image.height), Image.LANCZOS)
+        if fmt == "jpeg" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        elif image.mode not in ("RGB", "RGBA", "L"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        out = io.BytesIO()
+        image.save(out, pil_format, **options)
+        return out.getvalue()
+
+
+def _download(url: str, check_url: Callable[[str], None]) -> bytes:
+    # Redirects are followed by hand so every hop is checked against the allowlist
+    for _ in range(MAX_REDIRECTS + 1):
+        check_url(url)
+        with requests.get(url, timeout=15, stream=True, allow_redirects=False) as response:
+            if response.is_redirect:
+                url = urljoin(url, response.headers["location"])
+                continue
+            response.raise_for_status()
+            data = io.BytesIO()
+            for chunk in response.iter_content(64 * 1024):
+                data.write(chunk)
+                if data.tell() > MAX_ORIGINAL_BYTES:
+                    raise ValueError("original image too large")
+            return data.getvalue()
+    raise ValueError("too many redirects")
+
+
+class ImageProxy:
+    """Fetches originals once and serves resized variants from the disk cache."""
+
+    def __init__(self, cache: DiskLRUCache, allowed_hosts: Iterable[str]):
+        self.cache = cache
+        self.allowed_hosts = {host.strip().lower() for host in allowed_hosts if host.strip()}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def check_url(self, url: str) -> None:
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https") or (parsed.hostname or "").lower() not in self.allowed_hosts:
+            raise HTTPException(status_code=400, detail="Image host not allowed")
+
+    @staticmethod
+    def variant_key(url: str, width: int, fmt: str) -> str:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        return f"{digest}-{width}.{fmt}"
+
+    async def _original(self, url: str) -> bytes:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32] + ".orig"
+        path = self.cache.get(key)
+        if path is not None:
+            return await asyncio.to_thread(path.read_bytes)
+        try:
+            data = await asyncio.to_thread(_download, url, self.check_url)
+        except (requests.RequestException, ValueError) as exc:
+            logger.warning("Failed to fetch image %s: %s", url, exc)
+            raise HTTPException(status_code=502, detail="Could not fetch original image")
+        await asyncio.to_thread(self.cache.put, key, data)
+        return data
+
+    async def variant(self, url: str, width: int, fmt: str) -> Tuple[Path, str]:
+        """Return the cached file for a variant, producing it on first request."""
+        if Image is None:
+            raise HTTPException(status_code=501, detail="Image processing is not available")
+        if width not in IMAGE_WIDTHS:
+            raise HTTPException(status_code=400, detail=f"Width must be one of {list(IMAGE_WIDTHS)}")
+        self.check_url(url)
+        key = self.variant_key(url, width, fmt)
+        path = self.cache.get(key)
+        if path is None:
+            # One fetch/resize per variant even when many requests arrive at once
+            lock = self._locks.setdefault(key, asyncio.Lock())
+            try:
+                async with lock:
+                    path = self.cache.get(key)
+                    if path is None:
+                        original = await self._original(url)
+                        try:
+                            data = await asyncio.to_thread(_resize, original, width, fmt)
+                        except (OSError, ValueError, Image.DecompressionBombError) as exc:
+                            logger.warning("Failed to resize image %s: %s", url, exc)
+                            raise HTTPException(status_code=502, detail="Original is not a supported image")
+                        path = await asyncio.to_thread(self.cache.put, key, data)
+            finally:
+                # Failed fetches must not leave their lock behind either
+                self._locks.pop(key, None)
+        return path, key
+
+    async def warm(self, url: str, widths: Iterable[int] = SRCSET_WIDTHS, formats: Iterable[str] = ("webp",)) -> None:
+        """Precompute srcset variants for a newly created item's image."""
+        for fmt in formats:
+            if not format_available(fmt):
+                continue
+            for width in widths:
+                try:
+                    await self.variant(url, width, fmt)
+                except HTTPException as exc:
+                    logger.warning("Could not prewarm %s at %dw: %s", url, width, exc.detail)
+                    return
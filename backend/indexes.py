@@ -0,0 +1,59 @@
+import logging
+from typing import Dict, List
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Indexes backing the queries issued by server.py, per collection.
+INDEXES: Dict[str, List[IndexModel]] = {
+    "products": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("category", ASCENDING), ("_id", ASCENDING)], name="category_id"),
+    ],
+    "gallery": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("category", ASCENDING), ("_id", ASCENDING)], name="category_id"),
+    ],
+    "blogs": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)], name="created_at_id"),
+    ],
+    "faqs": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    ],
+    "contact_submissions": [
+        IndexModel([("created_at", DESCENDING)], name="created_at"),
+    ],
+    "inquiry_submissions": [
+        IndexModel([("created_at", DESCENDING)], name="created_at"),
+    ],
+}
+
+
+async def ensure_indexes(db) -> List[str]:
+    """Create any missing indexes and return them as `collection.index` names.
+
+    Existing indexes are left alone. A failure on one collection (for example
+    duplicate `id` values blocking a unique index) is logged and does not stop
+    the others from being created.
+    """
+    created = []
+    for collection_name, models in INDEXES.items():
+        collection = db[collection_name]
+        try:
+            existing = set(await collection.index_information())
+            missing = [model for model in models if model.document["name"] not in existing]
+            if not missing:
+                continue
+            names = await collection.create_indexes(missing)
+        except OperationFailure as exc:
+            logger.error("Failed to create indexes on %s: %s", collection_name, exc)
+            continue
+        for name in names:
+            logger.info("Created index %s.%s", collection_name, name)
+            created.append(f"{collection_name}.{name}")
+    if not created:
+        logger.info("All indexes already present")
+    return created
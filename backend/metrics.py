@@ -0,0 +1,286 @@
+import bisect
+import threading
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from pymongo import monitoring
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+Labels = Tuple[Tuple[str, str], ...]
+# A value sampled at render time: a bare number, or one value per label set
+Sample = Union[float, Iterable[Tuple[Dict[str, str], float]]]
+
+
+class Histogram:
+    """Cumulative-bucket histogram rendered in the Prometheus text format."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RequestStats:
+    """Mongo work attributed to the request currently being served."""
+
+    __slots__ = ("queries", "mongo_seconds", "documents")
+
+    def __init__(self):
+        self.queries = 0
+        self.mongo_seconds = 0.0
+        self.documents = 0
+
+
+# Set by the HTTP middleware. Motor runs driver calls in an executor with a
+# copy of the caller's context, so the command listener sees the same object.
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+def _format_labels(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    escaped = (
+        '%s="%s"' % (name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in pairs
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+class Registry:
+    """Thread-safe store for the handful of metrics this service exports."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._gauges: Dict[str, Dict[Labels, float]] = {}
+        self._help: Dict[str, str] = {}
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+
+    def describe(self, name: str, help_text: str, buckets: Optional[Tuple[float, ...]] = None) -> None:
+        self._help[name] = help_text
+        if buckets is not None:
+            self._buckets[name] = buckets
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self._buckets.get(name, LATENCY_BUCKETS))
+            histogram.observe(value)
+
+    def inc(self, name: str, amount: float = 1, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def add_gauge(self, name: str, amount: float, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._gauges.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def render(
+        self,
+        extra_gauges: Optional[Dict[str, Sample]] = None,
+        extra_counters: Optional[Dict[str, Sample]] = None,
+    ) -> str:
+        """Text exposition of every metric plus values sampled by the caller."""
+        lines: List[str] = []
+
+        def header(name: str, kind: str):
+            if name in self._help:
+                lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                header(name, "counter")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(labels)} {value:g}")
+            for name, series in sorted(self._gauges.items()):
+                header(name, "gauge")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(labels)} {value:g}")
+            for name, series in sorted(self._histograms.items()):
+                header(name, "histogram")
+                for labels, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(labels, (('le', f'{bound:g}'),))} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(labels, (('le', '+Inf'),))} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum:.6f}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        for kind, extra in (("counter", extra_counters), ("gauge", extra_gauges)):
+            for name, value in sorted((extra or {}).items()):
+                header(name, kind)
+                if isinstance(value, (int, float)):
+                    lines.append(f"{name} {value:g}")
+                    continue
+                for labels, sample in value:
+                    lines.append(f"{name}{_format_labels(tuple(sorted(labels.items())))} {sample:g}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+registry.describe("http_requests_total", "HTTP requests by route, method and status.")
+registry.describe("http_requests_in_flight", "HTTP requests currently being served.")
+registry.describe("http_request_duration_seconds", "HTTP request latency by route.")
+registry.describe("mongo_commands_total", "Mongo commands by command name and outcome.")
+registry.describe("mongo_command_duration_seconds", "Mongo command latency by command name.")
+registry.describe("mongo_documents_returned_total", "Documents returned by Mongo cursors.")
+registry.describe("http_request_mongo_queries", "Mongo commands issued per HTTP request.", COUNT_BUCKETS)
+registry.describe("http_request_mongo_seconds", "Time spent in Mongo per HTTP request.")
+registry.describe("http_request_mongo_documents", "Mongo documents returned per HTTP request.", COUNT_BUCKETS)
+registry.describe("mongo_pool_checkout_failures_total", "Failed connection pool checkouts by reason.")
+registry.describe("submissions_rejected_total", "Contact/inquiry submissions rejected by endpoint and reason.")
+
+
+def _returned_documents(reply) -> int:
+    cursor = reply.get("cursor") if hasattr(reply, "get") else None
+    if not cursor:
+        return 0
+    batch = cursor.get("firstBatch", cursor.get("nextBatch"))
+    return len(batch) if batch is not None else 0
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Times every driver command and charges it to the current request."""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        seconds = event.duration_micros / 1e6
+        documents = _returned_documents(event.reply)
+        registry.inc("mongo_commands_total", command=event.command_name, outcome="success")
+        registry.observe("mongo_command_duration_seconds", seconds, command=event.command_name)
+        if documents:
+            registry.inc("mongo_documents_returned_total", documents, command=event.command_name)
+        self._charge(seconds, documents)
+
+    def failed(self, event):
+        seconds = event.duration_micros / 1e6
+        registry.inc("mongo_commands_total", command=event.command_name, outcome="failure")
+        registry.observe("mongo_command_duration_seconds", seconds, command=event.command_name)
+        self._charge(seconds, 0)
+
+    @staticmethod
+    def _charge(seconds: float, documents: int):
+        stats = current_request.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.mongo_seconds += seconds
+            stats.documents += documents
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Tracks connection pool usage per server for the pool statistics view."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools: Dict[str, Dict[str, Any]] = {}
+
+    def _pool(self, address) -> Dict[str, Any]:
+        key = "%s:%s" % address
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = {
+                "max_pool_size": None, "open": 0, "checked_out": 0, "waiting": 0,
+                "created_total": 0, "closed_total": 0, "checkout_failures": {}, "cleared_total": 0,
+            }
+        return pool
+
+    def _update(self, address, **deltas) -> None:
+        with self._lock:
+            pool = self._pool(address)
+            for name, delta in deltas.items():
+                pool[name] += delta
+
+    def pool_created(self, event):
+        with self._lock:
+            self._pool(event.address)["max_pool_size"] = event.options.get("maxPoolSize")
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._update(event.address, cleared_total=1)
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._update(event.address, open=1, created_total=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._update(event.address, open=-1, closed_total=1)
+
+    def connection_check_out_started(self, event):
+        self._update(event.address, waiting=1)
+
+    def connection_check_out_failed(self, event):
+        reason = str(event.reason)
+        with self._lock:
+            pool = self._pool(event.address)
+            pool["waiting"] -= 1
+            pool["checkout_failures"][reason] = pool["checkout_failures"].get(reason, 0) + 1
+        registry.inc("mongo_pool_checkout_failures_total", reason=reason)
+
+    def connection_checked_out(self, event):
+        self._update(event.address, waiting=-1, checked_out=1)
+
+    def connection_checked_in(self, event):
+        self._update(event.address, checked_out=-1)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                address: dict(pool, checkout_failures=dict(pool["checkout_failures"]))
+                for address, pool in self._pools.items()
+            }
+
+    def saturated(self) -> bool:
+        """True when some pool has every connection in use and callers queued behind it."""
+        with self._lock:
+            return any(
+                pool["waiting"] > 0 and pool["max_pool_size"] and pool["checked_out"] >= pool["max_pool_size"]
+                for pool in self._pools.values()
+            )
+
+    def totals(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "mongo_pool_connections": sum(pool["open"] for pool in self._pools.values()),
+                "mongo_pool_checked_out": sum(pool["checked_out"] for pool in self._pools.values()),
+                "mongo_pool_waiting": sum(pool["waiting"] for pool in self._pools.values()),
+            }
+
+
+def server_timing(total_seconds: float, stats: RequestStats) -> str:
+    return (
+        f"app;dur={total_seconds * 1000:.2f}, "
+        f'db;dur={stats.mongo_seconds * 1000:.2f};desc="{stats.queries} queries, {stats.documents} docs"'
+    )
+
+
+def route_label(scope) -> str:
+    """Route template (e.g. `/api/blogs/{blog_id}`) to keep label cardinality bounded."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
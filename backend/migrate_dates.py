@@ -0,0 +1,86 @@
+"""Convert `created_at` ISO strings to native BSON dates.
+
+Older versions of the API stored `created_at` on blogs and form submissions as
+`datetime.isoformat()` strings. Run this once after deploying the version that
+writes BSON dates, then set LEGACY_STRING_DATES=false to drop the dual-read
+handling. It is safe to re-run; only string values are touched.
+
+    python migrate_dates.py [--dry-run] [--batch-size 1000]
+"""
+import argparse
+import asyncio
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+mongo_url = os.environ['MONGO_URL']
+db_name = os.environ['DB_NAME']
+
+COLLECTIONS = ("blogs", "contact_submissions", "inquiry_submissions")
+
+
+def parse(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+async def migrate_collection(collection, batch_size: int, dry_run: bool):
+    converted = failed = 0
+    batch = []
+    cursor = collection.find({"created_at": {"$type": "string"}}, {"_id": 1, "created_at": 1})
+    async for doc in cursor:
+        try:
+            created_at = parse(doc["created_at"])
+        except ValueError:
+            failed += 1
+            print(f"  ! {collection.name} {doc['_id']}: unparseable created_at {doc['created_at']!r}")
+            continue
+        # Matching on the old string keeps concurrent writers from being overwritten
+        batch.append(UpdateOne(
+            {"_id": doc["_id"], "created_at": doc["created_at"]},
+            {"$set": {"created_at": created_at}},
+        ))
+        if len(batch) >= batch_size:
+            converted += await flush(collection, batch, dry_run)
+    converted += await flush(collection, batch, dry_run)
+    return converted, failed
+
+
+async def flush(collection, batch, dry_run: bool) -> int:
+    if not batch:
+        return 0
+    count = len(batch)
+    if not dry_run:
+        result = await collection.bulk_write(batch, ordered=False)
+        count = result.modified_count
+    batch.clear()
+    return count
+
+
+async def migrate(batch_size: int, dry_run: bool):
+    client = AsyncIOMotorClient(mongo_url)
+    db = client[db_name]
+
+    print("Migrating created_at to BSON dates" + (" (dry run)" if dry_run else "") + "...")
+    for name in COLLECTIONS:
+        converted, failed = await migrate_collection(db[name], batch_size, dry_run)
+        print(f"✓ {name}: {converted} converted, {failed} failed")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert created_at strings to BSON dates.")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true", help="count documents without writing")
+    args = parser.parse_args()
+    asyncio.run(migrate(args.batch_size, args.dry_run))
@@ -0,0 +1,87 @@
+"""Motor client options read from the environment.
+
+Every setting is optional; unset values fall back to the connection string
+and then to the driver defaults.
+
+    MONGO_MAX_POOL_SIZE                 connections per host and per worker (100)
+    MONGO_MIN_POOL_SIZE                 connections kept open while idle (0)
+    MONGO_MAX_CONNECTING                connections being established at once (2)
+    MONGO_MAX_IDLE_TIME_MS              close pooled connections idle this long
+    MONGO_WAIT_QUEUE_TIMEOUT_MS         give up waiting for a free pooled connection
+    MONGO_SERVER_SELECTION_TIMEOUT_MS   give up finding a usable server (30000)
+    MONGO_CONNECT_TIMEOUT_MS            TCP connect timeout (20000)
+    MONGO_SOCKET_TIMEOUT_MS             per-operation socket read timeout
+    MONGO_COMPRESSORS                   wire compression, e.g. "zstd,snappy,zlib"
+    MONGO_ZLIB_COMPRESSION_LEVEL        -1..9 when zlib is negotiated
+    MONGO_QUERY_TIMEOUT_MS              server-side maxTimeMS for catalog reads
+    MONGO_CATALOG_READ_PREFERENCE       e.g. secondaryPreferred for catalog reads
+    MONGO_CATALOG_MAX_STALENESS_S       staleness bound for secondary catalog reads
+    MONGO_CATALOG_PRIMARY_AFTER_WRITE_S read from the primary this long after a write (60)
+"""
+import os
+from typing import Mapping, Optional
+
+from pymongo import read_preferences
+
+INT_OPTIONS = {
+    "MONGO_MAX_POOL_SIZE": "maxPoolSize",
+    "MONGO_MIN_POOL_SIZE": "minPoolSize",
+    "MONGO_MAX_CONNECTING": "maxConnecting",
+    "MONGO_MAX_IDLE_TIME_MS": "maxIdleTimeMS",
+    "MONGO_WAIT_QUEUE_TIMEOUT_MS": "waitQueueTimeoutMS",
+    "MONGO_SERVER_SELECTION_TIMEOUT_MS": "serverSelectionTimeoutMS",
+    "MONGO_CONNECT_TIMEOUT_MS": "connectTimeoutMS",
+    "MONGO_SOCKET_TIMEOUT_MS": "socketTimeoutMS",
+    "MONGO_ZLIB_COMPRESSION_LEVEL": "zlibCompressionLevel",
+}
+
+READ_PREFERENCES = {
+    "primary": read_preferences.Primary,
+    "primarypreferred": read_preferences.PrimaryPreferred,
+    "secondary": read_preferences.Secondary,
+    "secondarypreferred": read_preferences.SecondaryPreferred,
+    "nearest": read_preferences.Nearest,
+}
+
+
+def _int(environ: Mapping[str, str], name: str) -> Optional[int]:
+    value = environ.get(name, "").strip()
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {value!r}")
+
+
+def client_options(environ: Mapping[str, str] = os.environ) -> dict:
+    """Keyword arguments for AsyncIOMotorClient from the MONGO_* settings."""
+    options = {}
+    for name, option in INT_OPTIONS.items():
+        value = _int(environ, name)
+        if value is not None:
+            options[option] = value
+    compressors = environ.get("MONGO_COMPRESSORS", "").strip()
+    if compressors:
+        options["compressors"] = compressors
+    return options
+
+
+def query_timeout_ms(environ: Mapping[str, str] = os.environ) -> Optional[int]:
+    """maxTimeMS for catalog reads, or None to let queries run unbounded."""
+    value = _int(environ, "MONGO_QUERY_TIMEOUT_MS")
+    return value if value else None
+
+
+def catalog_read_preference(environ: Mapping[str, str] = os.environ):
+    """Read preference for catalog reads, or None to inherit the client's."""
+    mode = environ.get("MONGO_CATALOG_READ_PREFERENCE", "").strip()
+    if not mode:
+        return None
+    cls = READ_PREFERENCES.get(mode.lower())
+    if cls is None:
+        raise ValueError(f"Unknown MONGO_CATALOG_READ_PREFERENCE: {mode}")
+    if cls is read_preferences.Primary:
+        return cls()
+    max_staleness = _int(environ, "MONGO_CATALOG_MAX_STALENESS_S")
+    return cls(max_staleness=max_staleness if max_staleness is not None else -1)
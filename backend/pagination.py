@@ -0,0 +1,113 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from bson import ObjectId, json_util
+from fastapi import HTTPException
+
+# Upper bound for a single page; matches the old `.to_list(1000)` cap, except
+# that anything past it is now reachable through the next-page cursor.
+MAX_PAGE_SIZE = 1000
+
+SortSpec = Sequence[Tuple[str, int]]
+
+# Types a sort key can hold. Anything else in a cursor (notably a dict, which
+# would be read as query operators) is rejected. None comes from documents
+# missing the sort field.
+CURSOR_VALUE_TYPES = (datetime, str, ObjectId, type(None))
+
+
+def encode_cursor(values: Sequence) -> str:
+    raw = json_util.dumps(list(values)).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: SortSpec) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json_util.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, ValueError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != len(sort):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not all(isinstance(value, CURSOR_VALUE_TYPES) for value in values):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def keyset_filter(sort: SortSpec, values: Sequence) -> dict:
+    """Build the filter selecting documents strictly after `values` in `sort` order."""
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        clause = {sort[j][0]: values[j] for j in range(i)}
+        clause[field] = {"$gt" if direction > 0 else "$lt": values[i]}
+        clauses.append(clause)
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str], required: Iterable[str]) -> Optional[List[str]]:
+    """Validate a comma separated `fields=` parameter against the model's fields."""
+    if not fields:
+        return None
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    allowed = set(allowed)
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    for name in required:
+        if name not in requested:
+            requested.append(name)
+    return requested
+
+
+async def find_page(
+    collection,
+    query: dict,
+    sort: SortSpec,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    legacy_string_dates: bool = False,
+    max_time_ms: Optional[int] = None,
+) -> Tuple[List[dict], Optional[str]]:
+    """Fetch one keyset page and return it with the cursor for the next page.
+
+    `legacy_string_dates` covers collections part way through migration from
+    ISO string to BSON dates. Strings sort below dates in BSON order, so
+    after a date cursor in a descending sort every string value still follows.
+    `max_time_ms` bounds the query on the server side.
+    """
+    limit = min(limit or MAX_PAGE_SIZE, MAX_PAGE_SIZE)
+    sort_fields = [field for field, _ in sort]
+
+    if cursor:
+        values = decode_cursor(cursor, sort)
+        after = keyset_filter(sort, values)
+        if legacy_string_dates and isinstance(values[0], datetime) and sort[0][1] < 0:
+            after = {"$or": [after, {sort[0][0]: {"$type": "string"}}]}
+        query = {"$and": [query, after]} if query else after
+
+    if fields is None:
+        # Without an explicit projection every field is returned; `_id` is only
+        # kept when it doubles as the sort key and is stripped again below.
+        projection = None if "_id" in sort_fields else {"_id": 0}
+    else:
+        projection = {name: 1 for name in fields}
+        for name in sort_fields:
+            projection[name] = 1
+        projection.setdefault("_id", 0)
+
+    find = collection.find(query, projection).sort(list(sort))
+    if max_time_ms:
+        find = find.max_time_ms(max_time_ms)
+    docs = await find.to_list(limit + 1)
+
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor([docs[-1].get(name) for name in sort_fields])
+    if "_id" in sort_fields:
+        for doc in docs:
+            doc.pop("_id", None)
+    return docs, next_cursor
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, Optional, Tuple
+
+
+class TokenBucketLimiter:
+    """Per-key token buckets refilled at `rate` tokens per second up to `burst`.
+
+    At most `max_keys` buckets are kept; the least recently used one is
+    dropped first, which only ever forgets a key that has been quiet (a
+    forgotten key starts again with a full bucket).
+    """
+
+    def __init__(self, rate: float, burst: float, max_keys: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[Hashable, Tuple[float, float]]" = OrderedDict()
+        self.allowed = 0
+        self.rejected = 0
+        self.evictions = 0
+
+    def _tokens(self, key: Hashable, now: float) -> float:
+        tokens, updated = self._buckets.get(key, (self.burst, now))
+        return min(self.burst, tokens + (now - updated) * self.rate)
+
+    def check(self, key: Hashable, now: Optional[float] = None) -> Tuple[bool, float]:
+        """Whether `key` has a token, without taking it; returns (allowed, seconds until one is available)."""
+        if self.rate <= 0:
+            return True, 0.0
+        now = time.monotonic() if now is None else now
+        tokens = self._tokens(key, now)
+        if tokens >= 1:
+            return True, 0.0
+        self.rejected += 1
+        return False, (1 - tokens) / self.rate
+
+    def take(self, key: Hashable, now: Optional[float] = None) -> None:
+        """Take one token for `key`, once `check` has allowed it."""
+        if self.rate <= 0:
+            return
+        now = time.monotonic() if now is None else now
+        self._buckets[key] = (self._tokens(key, now) - 1, now)
+        self._buckets.move_to_end(key)
+        self.allowed += 1
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+            self.evictions += 1
+
+    def allow(self, key: Hashable, now: Optional[float] = None) -> Tuple[bool, float]:
+        """Take one token for `key` if it has one; returns (allowed, seconds until a token is available)."""
+        allowed, retry_after = self.check(key, now)
+        if allowed:
+            self.take(key, now)
+        return allowed, retry_after
+
+    def stats(self) -> dict:
+        return {
+            "keys": len(self._buckets),
+            "max_keys": self.max_keys,
+            "rate_per_second": self.rate,
+            "burst": self.burst,
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "evictions": self.evictions,
+        }
+
+
+class DuplicateFilter:
+    """Remembers content hashes seen within the last `window_seconds`.
+
+    Each hash keeps the value recorded with it (the original response), so a
+    repeat can be answered without writing again. Entries are ordered by last
+    sighting, which lets expiry and the `max_entries` bound both trim from the
+    oldest end.
+    """
+
+    def __init__(self, window_seconds: float, max_entries: int = 10000):
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.duplicates = 0
+
+    def _expire(self, now: float) -> None:
+        while self._entries:
+            digest, (seen_at, _) = next(iter(self._entries.items()))
+            if now - seen_at < self.window_seconds:
+                break
+            del self._entries[digest]
+
+    def get(self, digest: str, now: Optional[float] = None) -> Optional[Any]:
+        """Return the value stored for a repeat within the window, sliding it forward."""
+        if self.window_seconds <= 0:
+            return None
+        now = time.monotonic() if now is None else now
+        self._expire(now)
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+        self._entries[digest] = (now, entry[1])
+        self._entries.move_to_end(digest)
+        self.duplicates += 1
+        return entry[1]
+
+    def add(self, digest: str, value: Any, now: Optional[float] = None) -> None:
+        if self.window_seconds <= 0 or self.max_entries <= 0:
+            return
+        now = time.monotonic() if now is None else now
+        self._entries[digest] = (now, value)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, digest: str) -> None:
+        self._entries.pop(digest, None)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "window_seconds": self.window_seconds,
+            "duplicates": self.duplicates,
+        }
+
+
+def content_hash(kind: str, doc: dict, fields: Iterable[str]) -> str:
+    """Hash of the submitted fields, ignoring case and surrounding whitespace."""
+    normalized = {}
+    for name in fields:
+        value = doc.get(name)
+        normalized[name] = " ".join(value.lower().split()) if isinstance(value, str) else value
+    data = json.dumps([kind, normalized], sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
@@ -0,0 +1,360 @@
+import asyncio
+import bisect
+import heapq
+import logging
+import math
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from i18n import LANGUAGES
+
+logger = logging.getLogger(__name__)
+
+ZWNJ = "\u200c"
+
+# Arabic-script variants folded to the forms used in Persian and Pashto text,
+# so that e.g. Arabic yeh/kaf typed on an Arabic keyboard still match.
+_CHAR_MAP = str.maketrans({
+    "\u064a": "\u06cc",  # ARABIC YEH -> FARSI YEH
+    "\u0649": "\u06cc",  # ALEF MAKSURA -> FARSI YEH
+    "\u0643": "\u06a9",  # ARABIC KAF -> KEHEH
+    "\u0623": "\u0627",  # ALEF WITH HAMZA ABOVE -> ALEF
+    "\u0625": "\u0627",  # ALEF WITH HAMZA BELOW -> ALEF
+    "\u0671": "\u0627",  # ALEF WASLA -> ALEF
+    "\u0624": "\u0648",  # WAW WITH HAMZA -> WAW
+    "\u06c0": "\u0647",  # HEH WITH YEH ABOVE -> HEH
+    "\u0629": "\u0647",  # TEH MARBUTA -> HEH
+    "\u0640": None,      # TATWEEL
+    "\u200d": None,      # ZERO WIDTH JOINER
+    "\u200f": None,      # RIGHT-TO-LEFT MARK
+    "\u200e": None,      # LEFT-TO-RIGHT MARK
+    **{chr(0x06F0 + i): str(i) for i in range(10)},  # Extended Arabic-Indic digits
+    **{chr(0x0660 + i): str(i) for i in range(10)},  # Arabic-Indic digits
+})
+
+# Harakat and other combining marks that are optional in written Persian/Pashto
+_DIACRITICS = re.compile("[\u064b-\u065f\u0670\u06d6-\u06ed]")
+_WORD = re.compile(r"[^\W_]+(?:\u200c[^\W_]+)*")
+
+# Searchable fields per collection, with their ranking weight. Each entry is a
+# base name expanded to one field per language (`_en`, `_fa`, `_ps`).
+SEARCH_FIELDS: Dict[str, Dict[str, float]] = {
+    "products": {"name": 3.0, "description": 1.0},
+    "blogs": {"title": 3.0, "excerpt": 1.5, "content": 1.0},
+    "faqs": {"question": 2.0, "answer": 1.0},
+}
+
+# Fields copied into each hit so the client can render it without a fetch
+SUMMARY_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "products": ("name", "category", "image_url"),
+    "blogs": ("title", "excerpt", "image_url"),
+    "faqs": ("question",),
+}
+
+SEARCHABLE = tuple(SEARCH_FIELDS)
+PREFIX_EXPANSIONS = 20
+PREFIX_WEIGHT = 0.5
+RESULT_CACHE_SIZE = 512
+
+
+def projection(collection: str) -> dict:
+    """Mongo projection loading just what the index needs for a collection."""
+    fields = {"_id": 0, "id": 1}
+    for base in list(SEARCH_FIELDS[collection]) + list(SUMMARY_FIELDS[collection]):
+        fields[base] = 1
+        for lang in LANGUAGES:
+            fields[f"{base}_{lang}"] = 1
+    return fields
+
+
+def normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text).translate(_CHAR_MAP)
+    return _DIACRITICS.sub("", text).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into normalized tokens.
+
+    Words joined by a zero-width non-joiner (e.g. می‌کنند) produce both the
+    joined form and each part, so a query typed with or without the ZWNJ or
+    with a plain space matches.
+    """
+    tokens = []
+    for match in _WORD.finditer(normalize(text)):
+        word = match.group()
+        if ZWNJ in word:
+            parts = [part for part in word.split(ZWNJ) if part]
+            tokens.append("".join(parts))
+            tokens.extend(parts)
+        else:
+            tokens.append(word)
+    return tokens
+
+
+class SearchIndex:
+    """In-memory inverted index over the multilingual catalog text fields.
+
+    Postings map a token to the log-scaled weighted term frequency per
+    document key `(collection, id)`. Documents can be added or replaced one at
+    a time, which keeps the index current as the create endpoints write.
+
+    Queries are answered with Fagin's threshold algorithm over postings
+    sorted by term frequency, so only the head of each posting list is read
+    once the top results can no longer change. The sorted postings and the
+    sorted vocabulary are kept up to date in place for just the tokens a
+    changed document touches; only the per-query result cache is dropped.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[Tuple[str, str], float]] = {}
+        self._doc_tokens: Dict[Tuple[str, str], List[str]] = {}
+        self._summaries: Dict[Tuple[str, str], dict] = {}
+        self._vocabulary: Optional[List[str]] = None
+        # Per token, (-tf, key) in ascending order: highest term frequency first
+        self._ranked: Dict[str, List[Tuple[float, Tuple[str, str]]]] = {}
+        self._results: "OrderedDict[tuple, List[dict]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._doc_tokens)
+
+    def _add_posting(self, token: str, key: Tuple[str, str], tf: float) -> None:
+        postings = self._postings.get(token)
+        if postings is None:
+            postings = self._postings[token] = {}
+            if self._vocabulary is not None:
+                bisect.insort(self._vocabulary, token)
+        postings[key] = tf
+        ranked = self._ranked.get(token)
+        if ranked is not None:
+            bisect.insort(ranked, (-tf, key))
+
+    def _remove_posting(self, token: str, key: Tuple[str, str]) -> None:
+        postings = self._postings[token]
+        tf = postings.pop(key)
+        if not postings:
+            del self._postings[token]
+            self._ranked.pop(token, None)
+            if self._vocabulary is not None:
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+            return
+        ranked = self._ranked.get(token)
+        if ranked is not None:
+            del ranked[bisect.bisect_left(ranked, (-tf, key))]
+
+    def add(self, collection: str, doc: dict) -> None:
+        key = (collection, doc["id"])
+        weights: Dict[str, float] = defaultdict(float)
+        for base, weight in SEARCH_FIELDS[collection].items():
+            for lang in LANGUAGES:
+                value = doc.get(f"{base}_{lang}")
+                if value:
+                    for token in tokenize(value):
+                        weights[token] += weight
+        tfs = {token: 1 + math.log(weight) for token, weight in weights.items()}
+        previous = self._doc_tokens.get(key)
+        # Re-adding unchanged text (as a resync does) leaves the postings alone
+        if previous is None or len(previous) != len(tfs) or any(
+            self._postings.get(token, {}).get(key) != tf for token, tf in tfs.items()
+        ):
+            self.remove(*key)
+            for token, tf in tfs.items():
+                self._add_posting(token, key, tf)
+            self._doc_tokens[key] = list(tfs)
+        self._results.clear()
+        summary = {"type": collection, "id": doc["id"]}
+        for base in SUMMARY_FIELDS[collection]:
+            if base in doc:
+                summary[base] = doc[base]
+            for lang in LANGUAGES:
+                if f"{base}_{lang}" in doc:
+                    summary[f"{base}_{lang}"] = doc[f"{base}_{lang}"]
+        self._summaries[key] = summary
+
+    def add_many(self, collection: str, docs: Iterable[dict]) -> None:
+        for doc in docs:
+            self.add(collection, doc)
+
+    def remove(self, collection: str, doc_id: str) -> None:
+        key = (collection, doc_id)
+        if key not in self._doc_tokens:
+            return
+        self._results.clear()
+        for token in self._doc_tokens.pop(key):
+            self._remove_posting(token, key)
+        self._summaries.pop(key, None)
+
+    def ids(self, collection: str) -> Set[str]:
+        return {doc_id for name, doc_id in self._doc_tokens if name == collection}
+
+    def clear(self, collection: Optional[str] = None) -> None:
+        """Drop every document, or only those of one collection."""
+        for key in [key for key in self._doc_tokens if collection in (None, key[0])]:
+            self.remove(*key)
+
+    def _prefix_matches(self, prefix: str) -> List[str]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        matches = []
+        for token in self._vocabulary[start:start + PREFIX_EXPANSIONS + 1]:
+            if not token.startswith(prefix):
+                break
+            if token != prefix:
+                matches.append(token)
+        return matches[:PREFIX_EXPANSIONS]
+
+    def _ranked_postings(self, token: str) -> List[Tuple[float, Tuple[str, str]]]:
+        ranked = self._ranked.get(token)
+        if ranked is None:
+            ranked = self._ranked[token] = sorted((-tf, key) for key, tf in self._postings[token].items())
+        return ranked
+
+    def _token_idf(self, postings: dict) -> float:
+        return math.log(1 + (len(self._doc_tokens) or 1) / len(postings))
+
+    def search(self, query: str, types: Optional[Iterable[str]] = None, limit: int = 20) -> List[dict]:
+        """Rank documents by weighted TF-IDF; the last term also matches as a prefix."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        types = frozenset(types) if types else None
+        cache_key = (tuple(terms), types, limit)
+        results = self._results.get(cache_key)
+        if results is not None:
+            self._results.move_to_end(cache_key)
+            return [dict(result) for result in results]
+
+        # (boost, term bit, postings, postings by descending tf) per token
+        lists = []
+        for position, term in enumerate(terms):
+            expansions = [(term, 1.0)]
+            if position == len(terms) - 1:
+                expansions += [(token, PREFIX_WEIGHT) for token in self._prefix_matches(term)]
+            for token, factor in expansions:
+                postings = self._postings.get(token)
+                if postings:
+                    boost = factor * self._token_idf(postings)
+                    lists.append((boost, 1 << position, postings, self._ranked_postings(token)))
+
+        # Documents matching more of the query terms rank ahead of partial
+        # matches: the score is scaled by the fraction of terms matched.
+        count = len(terms)
+        top: List[Tuple[float, Tuple[str, str]]] = []
+        seen = set()
+        depth = 0
+        while True:
+            threshold = 0.0
+            exhausted = True
+            for boost, _, _, ranked in lists:
+                if depth >= len(ranked):
+                    continue
+                exhausted = False
+                neg_tf, key = ranked[depth]
+                threshold -= boost * neg_tf
+                if key in seen:
+                    continue
+                seen.add(key)
+                if types is not None and key[0] not in types:
+                    continue
+                score = 0.0
+                matched = 0
+                for other_boost, bit, postings, _ in lists:
+                    other_tf = postings.get(key)
+                    if other_tf is not None:
+                        score += other_boost * other_tf
+                        matched |= bit
+                entry = (score * bin(matched).count("1") / count, key)
+                if len(top) < limit:
+                    heapq.heappush(top, entry)
+                elif entry > top[0]:
+                    heapq.heapreplace(top, entry)
+            # No unseen document can score above the sum of the current heads
+            if exhausted or (len(top) >= limit and top[0][0] >= threshold):
+                break
+            depth += 1
+
+        ranked = sorted(top, reverse=True)
+        results = [{**self._summaries[key], "score": round(score, 4)} for score, key in ranked]
+        self._results[cache_key] = results
+        if len(self._results) > RESULT_CACHE_SIZE:
+            self._results.popitem(last=False)
+        return [dict(result) for result in results]
+
+
+class IndexSync:
+    """Picks up catalog writes handled by other worker processes.
+
+    Each worker indexes its own writes directly and touches its own marker
+    file per collection in `directory`. Every worker polls the markers of the
+    others and resyncs a collection from Mongo once one of them is newer than
+    its last resync. With a single worker this never resyncs.
+    """
+
+    MARKER = ".search.{}.{}.dirty"
+
+    def __init__(self, directory: Path, resync: Callable[[str], Awaitable[None]], interval: float = 5.0):
+        self.directory = Path(directory)
+        self.resync = resync
+        self.interval = interval
+        self._synced_at: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, synced_at: float) -> None:
+        """Start polling; `synced_at` is when the initial index build began reading."""
+        self._synced_at = {collection: synced_at for collection in SEARCHABLE}
+        if self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    def mark(self, collection: str) -> None:
+        if collection not in SEARCHABLE:
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            (self.directory / self.MARKER.format(collection, os.getpid())).touch()
+        except OSError:
+            logger.exception("Could not mark search collection %s changed", collection)
+
+    def stale_collections(self) -> List[str]:
+        stale = []
+        for collection in SEARCHABLE:
+            own = self.MARKER.format(collection, os.getpid())
+            for marker in self.directory.glob(self.MARKER.format(collection, "*")):
+                if marker.name == own:
+                    continue
+                try:
+                    mtime = marker.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+                if mtime >= self._synced_at.get(collection, 0.0):
+                    stale.append(collection)
+                    break
+        return stale
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            for collection in self.stale_collections():
+                # Writes marked after this point are picked up by the next poll
+                started = time.time()
+                try:
+                    await self.resync(collection)
+                except Exception:
+                    logger.exception("Search resync of %s failed", collection)
+                    continue
+                self._synced_at[collection] = started
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for marker in self.directory.glob(self.MARKER.format("*", os.getpid())):
+            marker.unlink(missing_ok=True)
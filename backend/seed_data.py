@@ -6,6 +6,8 @@ from pathlib import Path
 import uuid
 from datetime import datetime, timezone
 
+from indexes import ensure_indexes
+
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
@@ -90,7 +92,7 @@ async def seed_database():
             "content_fa": "ترشی‌های سنتی بیش از یک همراه خوشمزه برای غذاها هستند. آن‌ها سرشار از پروبیوتیک‌ها هستند که سلامت روده را ترویج می‌کنند، ایمنی را تقویت کرده و هضم را بهبود می‌بخشند.\n\nفرآیند تخمیر باکتری‌های مفیدی را ایجاد می‌کند که به حفظ تعادل سالم در سیستم گوارشی شما کمک می‌کنند. مصرف منظم ترشی همچنین می‌تواند به جذب مواد مغذی کمک کند و حتی ممکن است به مدیریت وزن کمک کند.\n\nدر گل‌نواز، ما ترشی‌های خود را با استفاده از روش‌های سنتی آزمایش شده تهیه می‌کنیم و اطمینان حاصل می‌کنیم که شما تمام مزایای سلامتی را همراه با طعم اصیل دریافت می‌کنید.",
             "content_ps": "دودیزې ترشۍ د خوړو لپاره یوازې د خوندور ملګري څخه ډیر دي. دوی په پروبیوټیکونو ډک دي چې د معدې روغتیا ته وده ورکوي، د معافیت ځواک قوي کوي او هضم ښه کوي.\n\nد خمیرولو پروسه ګټور باکتریا رامینځته کوي چې ستاسو په هضمي سیسټم کې د روغ توازن ساتلو کې مرسته کوي. د ترشیو منظم استعمال کولای شي د مغذي موادو جذب کې هم مرسته وکړي او حتی ممکن د وزن مدیریت کې مرسته وکړي.\n\nپه ګلنواز کې، موږ خپلې ترشۍ د وخت آزمویل شوي دودیزو میتودونو په کارولو سره چمتو کوو، ډاډ ترلاسه کوو چې تاسو د اصلي خوند سره سره ټولې روغتیایي ګټې ترلاسه کړئ.",
             "image_url": "https://images.unsplash.com/photo-1617854307432-13950e24ba07",
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         },
         {
             "id": str(uuid.uuid4()),
@@ -104,7 +106,7 @@ async def seed_database():
             "content_fa": "عرقیات گیاهی که به عنوان هیدروسول یا آب‌های گلی نیز شناخته می‌شوند، برای حفظ خواص درمانی خود نیاز به نگهداری مناسب دارند.\n\nهمیشه عرقیات گیاهی را در بطری‌های شیشه‌ای تیره، به دور از نور مستقیم خورشید و گرما نگهداری کنید. دمای ایده‌آل نگهداری بین 10 تا 15 درجه سانتی‌گراد است. مطمئن شوید که درپوش به شدت بسته است تا از اکسیداسیون جلوگیری شود.\n\nهنگامی که به درستی ذخیره می‌شوند، اکثر عرقیات گیاهی می‌توانند کیفیت خود را تا 12-18 ماه حفظ کنند. با این حال، همیشه قبل از استفاده از هرگونه تغییر در رنگ یا بو بررسی کنید.",
             "content_ps": "د بوټو عرقیات، چې د هیدروسول یا د ګلونو اوبو په نوم هم پیژندل کیږي، د دوی د درملنې ځانګړتیاوو ساتلو لپاره سم ساتنې ته اړتیا لري.\n\nتل د بوټو عرقیات په تیاره شیشې بوتلونو کې، د مستقیم لمر رڼا او تودوخې څخه لیرې وساتئ. د ساتلو مثالي حرارت د 10-15 درجو تر منځ دی. ډاډ ترلاسه کړئ چې ټوپۍ په کلکه تړل شوې ده ترڅو د اکسیډیشن مخه ونیسي.\n\nکله چې په سمه توګه ساتل کیږي، ډیری بوټي عرقیات کولی شي خپل کیفیت تر 12-18 میاشتو پورې وساتي. په هرصورت، د کارولو دمخه د رنګ یا بوی کې د هر ډول بدلون لپاره تل وګورئ.",
             "image_url": "https://images.unsplash.com/photo-1722931303388-527993417e23",
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         },
         {
             "id": str(uuid.uuid4()),
@@ -118,7 +120,7 @@ async def seed_database():
             "content_fa": "افغانستان سنت غنی نگهداری مواد غذایی دارد که از نسلی به نسل دیگر منتقل شده است. این روش‌ها از ضرورت در سرزمینی با زمستان‌های سخت و دسترسی محدود به محصولات تازه در طول سال ایجاد شدند.\n\nترشی کردن، خشک کردن و تخمیر تکنیک‌های اصلی نگهداری هستند. خشک کردن میوه‌ها و سبزیجات در آفتاب، تهیه کنسرو با سرکه و نمک، و ایجاد عرقیات گیاهی همگی بخشی از میراث آشپزی افغانی هستند.\n\nدر گل‌نواز، ما این سنت‌ها را گرامی می‌داریم در حالی که استانداردهای مدرن ایمنی مواد غذایی را تضمین می‌کنیم و محصولاتی را برای شما ارائه می‌دهیم که شما را به میراث فرهنگی افغانی متصل می‌کند.",
             "content_ps": "افغانستان د خواړو ساتلو بډایه دود لري چې له نسلونو څخه منتقل شوی. دا میتودونه په یوه ځمکه کې د اړتیا څخه رامینځته شوي چې سخت ژمي او په کال کې د تازه محصولاتو لپاره محدود لاسرسی لري.\n\nترشي کول، وچول، او خمیرول د ساتلو اصلي تخنیکونه دي. د میوو او سبزیجاتو په لمر کې وچول، د سرکې او مالګې سره محفوظات جوړول، او د بوټو عرقیات رامینځته کول ټول د افغان پخلنځي میراث برخه ده.\n\nپه ګلنواز کې، موږ دا دودونه درناوی کوو په داسې حال کې چې د خوړو د خوندیتوب عصري معیارونه تضمین کوو، تاسو ته هغه محصولات راوړو چې تاسو د افغان کلتوري میراث سره نښلوي.",
             "image_url": "https://images.pexels.com/photos/5953727/pexels-photo-5953727.jpeg",
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         }
     ]
     
@@ -196,6 +198,9 @@ async def seed_database():
     await db.gallery.insert_many(gallery_images)
     print(f"✓ Seeded {len(gallery_images)} gallery images")
     
+    created = await ensure_indexes(db)
+    print(f"✓ Created {len(created)} indexes")
+    
     print("✅ Database seeding completed successfully!")
     
     client.close()
@@ -0,0 +1,42 @@
+from typing import Any, Dict, List, Type
+
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+# Matches pydantic's output for the UTC datetimes we store: `...Z` suffix, and
+# naive values (as returned by Mongo for BSON dates) treated as UTC.
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC if orjson is not None else 0
+
+_list_adapters: Dict[type, TypeAdapter] = {}
+
+
+def validated_list_json(model: Type[BaseModel], docs: List[dict]) -> bytes:
+    """Validate every document through `model` and encode the list (strict path)."""
+    adapter = _list_adapters.get(model)
+    if adapter is None:
+        adapter = _list_adapters[model] = TypeAdapter(List[model])
+    return adapter.dump_json(adapter.validate_python(docs))
+
+
+def dump_json(content: Any, fast: bool = False) -> bytes:
+    """Encode plain documents without model validation, with orjson when `fast`."""
+    if fast and orjson is not None:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+    return to_json(content)
+
+
+def list_json(model: Type[BaseModel], docs: List[dict], fast: bool = False) -> bytes:
+    """Encode a list response.
+
+    The fast path trusts documents that were validated by the create models
+    before being written and only encodes them. Optional fields missing from
+    a stored document are omitted instead of rendered as null.
+    """
+    if fast and orjson is not None:
+        return orjson.dumps(docs, option=ORJSON_OPTIONS)
+    return validated_list_json(model, docs)
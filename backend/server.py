@@ -1,25 +1,154 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, BackgroundTasks, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import ConnectionFailure, ExecutionTimeout
+import asyncio
+import math
 import os
+import time
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional
+from typing import Any, Awaitable, Callable, List, Optional, Tuple, Type, Union
 import uuid
 from datetime import datetime, timezone
 
+from batch_writer import BatchWriter
+from bulk_import import bulk_upsert
+from cache import CachedPayload, ResponseCache
+from compression import THREAD_MIN_SIZE, CompressionMiddleware, negotiate_encoding
+from export_snapshots import SnapshotExporter
+from image_proxy import FORMATS, DiskLRUCache, ImageProxy, negotiate_format
+from indexes import ensure_indexes
+from metrics import (
+    MongoCommandListener, PoolStatsListener, RequestStats, current_request, registry, route_label, server_timing,
+)
+from mongo_settings import catalog_read_preference, client_options, query_timeout_ms
+from i18n import localize, localized_model, negotiate_language, storage_fields
+from pagination import MAX_PAGE_SIZE, find_page, parse_fields
+from rate_limit import DuplicateFilter, TokenBucketLimiter, content_hash
+from serialization import dump_json, list_json, orjson
+from search import SEARCHABLE, IndexSync, SearchIndex, projection as search_projection
+
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+pool_stats = PoolStatsListener()
+client = AsyncIOMotorClient(
+    mongo_url, tz_aware=True, event_listeners=[MongoCommandListener(), pool_stats], **client_options()
+)
 db = client[os.environ['DB_NAME']]
 
+# Catalog reads are bounded by maxTimeMS and may be routed to secondaries;
+# submissions and other writes always go through `db` as configured.
+QUERY_TIMEOUT_MS = query_timeout_ms()
+CATALOG_READ_PREFERENCE = catalog_read_preference()
+READY_TIMEOUT = float(os.environ.get('MONGO_READY_TIMEOUT', '1'))
+
+# After a write to a catalog collection this process reads it from the primary
+# for a while, so the cache refill that follows the invalidation can't pick up
+# (and keep for CATALOG_CACHE_TTL) a lagging secondary's copy.
+PRIMARY_AFTER_WRITE = float(os.environ.get('MONGO_CATALOG_PRIMARY_AFTER_WRITE_S', '60'))
+catalog_written_at = {}
+
+def catalog(name: str):
+    collection = db[name]
+    if CATALOG_READ_PREFERENCE is None:
+        return collection
+    written_at = catalog_written_at.get(name)
+    if written_at is not None and time.monotonic() - written_at < PRIMARY_AFTER_WRITE:
+        return collection
+    return collection.with_options(read_preference=CATALOG_READ_PREFERENCE)
+
+# `created_at` used to be stored as an ISO string. While LEGACY_STRING_DATES is
+# on (until migrate_dates.py has been run), reads accept both representations.
+LEGACY_STRING_DATES = os.environ.get('LEGACY_STRING_DATES', 'true').lower() in ('1', 'true', 'yes')
+
+# Read-through cache for catalog endpoints (products, gallery, blogs, faqs)
+catalog_cache = ResponseCache(
+    ttl_seconds=float(os.environ.get('CATALOG_CACHE_TTL', '300')),
+    max_entries=int(os.environ.get('CATALOG_CACHE_MAX_ENTRIES', '256')),
+    max_bytes=int(os.environ.get('CATALOG_CACHE_MAX_BYTES', str(64 * 1024 * 1024))),
+)
+
+# Optional write-behind batching for contact/inquiry submissions. When
+# disabled each submission is written with insert_one inside the request.
+SUBMISSION_WRITE_BEHIND = os.environ.get('SUBMISSION_WRITE_BEHIND', 'false').lower() in ('1', 'true', 'yes')
+submission_writers = {}
+
+# Spam protection for contact/inquiry: token buckets per client IP and per
+# email address, and a repeat of an identical submission within the window
+# gets the original response back instead of being stored again. Behind a
+# proxy, run uvicorn with --proxy-headers so the client IP is the real one.
+RATE_LIMIT_MAX_KEYS = int(os.environ.get('RATE_LIMIT_MAX_KEYS', '10000'))
+ip_limiter = TokenBucketLimiter(
+    rate=float(os.environ.get('SUBMISSION_IP_RATE_PER_MINUTE', '10')) / 60,
+    burst=float(os.environ.get('SUBMISSION_IP_BURST', '5')),
+    max_keys=RATE_LIMIT_MAX_KEYS,
+)
+email_limiter = TokenBucketLimiter(
+    rate=float(os.environ.get('SUBMISSION_EMAIL_RATE_PER_MINUTE', '2')) / 60,
+    burst=float(os.environ.get('SUBMISSION_EMAIL_BURST', '3')),
+    max_keys=RATE_LIMIT_MAX_KEYS,
+)
+submission_dedup = DuplicateFilter(
+    window_seconds=float(os.environ.get('SUBMISSION_DEDUP_WINDOW', '600')),
+    max_entries=RATE_LIMIT_MAX_KEYS,
+)
+
+# In-memory full-text index over products, blogs and FAQs; built on startup
+# and updated by the create/bulk endpoints of this process. Writes handled by
+# other workers are picked up through marker files in SEARCH_SYNC_DIR, which
+# must be shared by all workers of one deployment.
+search_index = SearchIndex()
+
+# Resizing image proxy with an on-disk LRU cache of originals and variants
+image_proxy = ImageProxy(
+    DiskLRUCache(
+        Path(os.environ.get('IMAGE_CACHE_DIR', ROOT_DIR / 'image_cache')),
+        max_bytes=int(os.environ.get('IMAGE_CACHE_MAX_BYTES', str(512 * 1024 * 1024))),
+    ),
+    allowed_hosts=os.environ.get('IMAGE_PROXY_HOSTS', 'images.unsplash.com,images.pexels.com').split(','),
+)
+IMAGE_PREWARM = os.environ.get('IMAGE_PREWARM', 'false').lower() in ('1', 'true', 'yes')
+
+# Opt-in fast JSON path: catalog documents are validated by the create models
+# before they are stored, so reads skip per-item model construction and are
+# encoded with orjson.
+FAST_JSON = os.environ.get('FAST_JSON', 'false').lower() in ('1', 'true', 'yes') and orjson is not None
+
+# gzip/brotli for responses of at least COMPRESSION_MIN_SIZE bytes; disable
+# when a proxy in front of the API already compresses.
+COMPRESSION = os.environ.get('COMPRESSION', 'true').lower() in ('1', 'true', 'yes')
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', '1024'))
+
 # Create the main app
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse if FAST_JSON else JSONResponse)
+
+# Static snapshot export for CDN/nginx serving, re-run after catalog writes by
+# whichever worker holds the snapshot directory's lock
+SNAPSHOT_DIR = os.environ.get('SNAPSHOT_DIR')
+snapshot_exporter = (
+    SnapshotExporter(
+        app, Path(SNAPSHOT_DIR),
+        delay=float(os.environ.get('SNAPSHOT_DELAY', '2')),
+        brotli_quality=int(os.environ.get('SNAPSHOT_BROTLI_QUALITY', '5')),
+    )
+    if SNAPSHOT_DIR else None
+)
+
+def catalog_changed(*routes: str):
+    now = time.monotonic()
+    for route in routes:
+        catalog_written_at[route] = now
+        search_sync.mark(route)
+    catalog_cache.invalidate(*routes)
+    if snapshot_exporter is not None:
+        snapshot_exporter.schedule(*routes)
 
 # Create a router with /api prefix
 api_router = APIRouter(prefix="/api")
@@ -136,6 +265,102 @@ class FAQ(BaseModel):
     answer_fa: str
     answer_ps: str
 
+# Catalog responses are serialized once per cache fill and then served as
+# stored bytes, answering If-None-Match revalidations with 304. Compressed
+# bodies are cached on the payload next to the uncompressed one.
+async def payload_response(request: Request, payload: CachedPayload) -> Response:
+    encoding = None
+    headers = {"Cache-Control": "no-cache", **payload.headers}
+    if COMPRESSION and len(payload.body) >= COMPRESSION_MIN_SIZE:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+        headers["Vary"] = "Accept-Encoding"
+    headers["ETag"] = payload.etag_for(encoding)
+    if payload.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    if payload.has_encoding(encoding):
+        content = payload.encoded(encoding)
+    else:
+        if len(payload.body) < THREAD_MIN_SIZE:
+            content = payload.encoded(encoding)
+        else:
+            content = await asyncio.to_thread(payload.encoded, encoding)
+        # The new compressed body counts against the cache's byte budget
+        catalog_cache.trim()
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(content=content, media_type=payload.media_type, headers=headers)
+
+def list_view(
+    model: Type[BaseModel], fields: Optional[str], lang: Optional[str], required: List[str]
+) -> Tuple[Optional[List[str]], Type[BaseModel]]:
+    """Resolve the Mongo projection and response schema for a list request.
+
+    With a language selected, `fields` names refer to the compact schema
+    (`title` rather than `title_en`) and only that language is projected.
+    """
+    if lang is None:
+        projection = parse_fields(fields, model.model_fields, required)
+        if projection is None and FAST_JSON:
+            # Without model validation, the projection is what drops unknown keys
+            projection = list(model.model_fields)
+        return projection, model
+    compact = localized_model(model)
+    selected = parse_fields(fields, compact.model_fields, required)
+    return storage_fields(model, lang, selected), compact
+
+async def cached_list_response(
+    request: Request,
+    cache_key: Any,
+    model: Type[BaseModel],
+    load: Callable[[], Awaitable[Tuple[List[dict], Optional[str]]]],
+    partial: bool = False,
+    lang: Optional[str] = None,
+) -> Response:
+    payload = catalog_cache.get(cache_key)
+    if payload is None:
+        # A write landing while load() runs must not leave its stale result cached
+        generation = catalog_cache.generation(cache_key[0])
+        docs, next_cursor = await load()
+        if lang is not None:
+            docs = [localize(doc, lang) for doc in docs]
+        # Projected documents are partial, so they can't go through the full model
+        body = dump_json(docs, FAST_JSON) if partial else list_json(model, docs, FAST_JSON)
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+        payload = CachedPayload(body, headers=headers)
+        catalog_cache.set(cache_key, payload, generation)
+    response = await payload_response(request, payload)
+    if request.query_params.get("lang") == "auto":
+        response.headers.add_vary_header("Accept-Language")
+    return response
+
+def parse_legacy_dates(docs: List[dict]):
+    if not LEGACY_STRING_DATES:
+        return
+    for doc in docs:
+        if isinstance(doc.get('created_at'), str):
+            doc['created_at'] = datetime.fromisoformat(doc['created_at'])
+
+def created_at_range(since: Optional[datetime], until: Optional[datetime]) -> dict:
+    bounds = {}
+    if since is not None:
+        bounds["$gte"] = since if since.tzinfo else since.replace(tzinfo=timezone.utc)
+    if until is not None:
+        bounds["$lt"] = until if until.tzinfo else until.replace(tzinfo=timezone.utc)
+    if not bounds:
+        return {}
+    query = {"created_at": bounds}
+    if LEGACY_STRING_DATES:
+        legacy = {op: value.astimezone(timezone.utc).isoformat() for op, value in bounds.items()}
+        query = {"$or": [query, {"created_at": legacy}]}
+    return query
+
+# Keyset pagination order per collection. Collections without `created_at`
+# page by `_id`, which keeps their natural insertion order.
+BLOG_SORT = [("created_at", -1), ("id", -1)]
+INSERTION_SORT = [("_id", 1)]
+
+PageLimit = Query(None, ge=1, le=MAX_PAGE_SIZE)
+
 # Routes
 @api_router.get("/")
 async def root():
@@ -143,99 +368,438 @@ async def root():
 
 # Products
 @api_router.get("/products", response_model=List[Product])
-async def get_products(category: Optional[str] = None):
-    query = {}
-    if category:
-        query["category"] = category
-    
-    products = await db.products.find(query, {"_id": 0}).to_list(1000)
-    return products
-
-@api_router.get("/products/{product_id}", response_model=Product)
-async def get_product(product_id: str):
-    product = await db.products.find_one({"id": product_id}, {"_id": 0})
+async def get_products(
+    request: Request,
+    category: Optional[str] = None,
+    limit: Optional[int] = PageLimit,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    lang: Optional[str] = None,
+):
+    lang = negotiate_language(lang, request.headers.get("accept-language"))
+    projection, response_model = list_view(Product, fields, lang, required=["id"])
+
+    async def load():
+        query = {}
+        if category:
+            query["category"] = category
+        return await find_page(
+            catalog("products"), query, INSERTION_SORT, limit, cursor, projection, max_time_ms=QUERY_TIMEOUT_MS,
+        )
+
+    cache_key = catalog_cache.make_key(
+        "products", category=category or None, limit=limit, cursor=cursor, fields=fields, lang=lang
+    )
+    return await cached_list_response(
+        request, cache_key, response_model, load, partial=fields is not None, lang=lang
+    )
+
+@api_router.get("/products/{product_id}", response_model=Union[Product, localized_model(Product)])
+async def get_product(request: Request, product_id: str, lang: Optional[str] = None):
+    lang = negotiate_language(lang, request.headers.get("accept-language"))
+    projection = {"_id": 0}
+    if lang is not None or FAST_JSON:
+        projection.update({name: 1 for name in storage_fields(Product, lang)})
+    product = await catalog("products").find_one({"id": product_id}, projection, max_time_ms=QUERY_TIMEOUT_MS)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
+    if lang is not None:
+        product = localize(product, lang)
+    if FAST_JSON:
+        return Response(content=dump_json(product, fast=True), media_type="application/json")
     return product
 
 @api_router.post("/products", response_model=Product)
-async def create_product(product: ProductCreate):
+async def create_product(product: ProductCreate, background_tasks: BackgroundTasks):
     product_dict = product.model_dump()
     product_obj = Product(**product_dict)
     doc = product_obj.model_dump()
     await db.products.insert_one(doc)
+    catalog_changed("products")
+    search_index.add("products", doc)
+    if IMAGE_PREWARM:
+        background_tasks.add_task(image_proxy.warm, doc["image_url"])
     return product_obj
 
 # Blogs
 @api_router.get("/blogs", response_model=List[Blog])
-async def get_blogs():
-    blogs = await db.blogs.find({}, {"_id": 0}).sort("created_at", -1).to_list(1000)
-    for blog in blogs:
-        if isinstance(blog['created_at'], str):
-            blog['created_at'] = datetime.fromisoformat(blog['created_at'])
-    return blogs
-
-@api_router.get("/blogs/{blog_id}", response_model=Blog)
-async def get_blog(blog_id: str):
-    blog = await db.blogs.find_one({"id": blog_id}, {"_id": 0})
+async def get_blogs(
+    request: Request,
+    limit: Optional[int] = PageLimit,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    lang: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    lang = negotiate_language(lang, request.headers.get("accept-language"))
+    projection, response_model = list_view(Blog, fields, lang, required=["id", "created_at"])
+
+    async def load():
+        blogs, next_cursor = await find_page(
+            catalog("blogs"), created_at_range(since, until), BLOG_SORT, limit, cursor, projection,
+            legacy_string_dates=LEGACY_STRING_DATES,
+            max_time_ms=QUERY_TIMEOUT_MS,
+        )
+        parse_legacy_dates(blogs)
+        return blogs, next_cursor
+
+    cache_key = catalog_cache.make_key(
+        "blogs", limit=limit, cursor=cursor, fields=fields, lang=lang,
+        since=since.isoformat() if since else None, until=until.isoformat() if until else None,
+    )
+    return await cached_list_response(
+        request, cache_key, response_model, load, partial=fields is not None, lang=lang
+    )
+
+@api_router.get("/blogs/{blog_id}", response_model=Union[Blog, localized_model(Blog)])
+async def get_blog(request: Request, blog_id: str, lang: Optional[str] = None):
+    lang = negotiate_language(lang, request.headers.get("accept-language"))
+    projection = {"_id": 0}
+    if lang is not None or FAST_JSON:
+        projection.update({name: 1 for name in storage_fields(Blog, lang)})
+    blog = await catalog("blogs").find_one({"id": blog_id}, projection, max_time_ms=QUERY_TIMEOUT_MS)
     if not blog:
         raise HTTPException(status_code=404, detail="Blog not found")
-    if isinstance(blog['created_at'], str):
-        blog['created_at'] = datetime.fromisoformat(blog['created_at'])
+    parse_legacy_dates([blog])
+    if lang is not None:
+        blog = localize(blog, lang)
+    if FAST_JSON:
+        return Response(content=dump_json(blog, fast=True), media_type="application/json")
     return blog
 
 @api_router.post("/blogs", response_model=Blog)
-async def create_blog(blog: BlogCreate):
+async def create_blog(blog: BlogCreate, background_tasks: BackgroundTasks):
     blog_dict = blog.model_dump()
     blog_obj = Blog(**blog_dict)
     doc = blog_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
     await db.blogs.insert_one(doc)
+    catalog_changed("blogs", "home")
+    search_index.add("blogs", doc)
+    if IMAGE_PREWARM:
+        background_tasks.add_task(image_proxy.warm, doc["image_url"])
     return blog_obj
 
 # Gallery
 @api_router.get("/gallery", response_model=List[GalleryImage])
-async def get_gallery(category: Optional[str] = None):
-    query = {}
-    if category and category != "all":
-        query["category"] = category
-    
-    images = await db.gallery.find(query, {"_id": 0}).to_list(1000)
-    return images
+async def get_gallery(
+    request: Request,
+    category: Optional[str] = None,
+    limit: Optional[int] = PageLimit,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    lang: Optional[str] = None,
+):
+    lang = negotiate_language(lang, request.headers.get("accept-language"))
+    if category == "all":
+        category = None
+    projection, response_model = list_view(GalleryImage, fields, lang, required=["id"])
+
+    async def load():
+        query = {}
+        if category:
+            query["category"] = category
+        return await find_page(
+            catalog("gallery"), query, INSERTION_SORT, limit, cursor, projection, max_time_ms=QUERY_TIMEOUT_MS,
+        )
+
+    cache_key = catalog_cache.make_key(
+        "gallery", category=category or None, limit=limit, cursor=cursor, fields=fields, lang=lang
+    )
+    return await cached_list_response(
+        request, cache_key, response_model, load, partial=fields is not None, lang=lang
+    )
 
 @api_router.post("/gallery", response_model=GalleryImage)
-async def create_gallery_image(image: GalleryImageCreate):
+async def create_gallery_image(image: GalleryImageCreate, background_tasks: BackgroundTasks):
     image_dict = image.model_dump()
     image_obj = GalleryImage(**image_dict)
     doc = image_obj.model_dump()
     await db.gallery.insert_one(doc)
+    catalog_changed("gallery", "home")
+    if IMAGE_PREWARM:
+        background_tasks.add_task(image_proxy.warm, doc["image_url"])
     return image_obj
 
 # FAQs
 @api_router.get("/faqs", response_model=List[FAQ])
-async def get_faqs():
-    faqs = await db.faqs.find({}, {"_id": 0}).to_list(1000)
-    return faqs
+async def get_faqs(
+    request: Request,
+    limit: Optional[int] = PageLimit,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    lang: Optional[str] = None,
+):
+    lang = negotiate_language(lang, request.headers.get("accept-language"))
+    projection, response_model = list_view(FAQ, fields, lang, required=["id"])
 
-# Contact
-@api_router.post("/contact", response_model=ContactSubmission)
-async def submit_contact(submission: ContactSubmissionCreate):
+    async def load():
+        return await find_page(
+            catalog("faqs"), {}, INSERTION_SORT, limit, cursor, projection, max_time_ms=QUERY_TIMEOUT_MS,
+        )
+
+    cache_key = catalog_cache.make_key(
+        "faqs", limit=limit, cursor=cursor, fields=fields, lang=lang
+    )
+    return await cached_list_response(
+        request, cache_key, response_model, load, partial=fields is not None, lang=lang
+    )
+
+# Bulk NDJSON import. Each line is validated against the create model and
+# upserted by `id`; lines without an `id` get a new one.
+def bulk_builder(create_model: Type[BaseModel], timestamped: bool = False):
+    def build(item: dict):
+        item_id = item.pop("id", None) or str(uuid.uuid4())
+        if not isinstance(item_id, str):
+            raise ValueError("id: Input should be a valid string")
+        doc = create_model(**item).model_dump()
+        doc["id"] = item_id
+        on_insert = {}
+        if timestamped:
+            on_insert["created_at"] = datetime.now(timezone.utc)
+        return doc, on_insert
+    return build
+
+@api_router.post("/products/bulk")
+async def bulk_import_products(request: Request):
+    summary = await bulk_upsert(
+        db.products, request.stream(), bulk_builder(ProductCreate),
+        on_written=lambda docs: search_index.add_many("products", docs),
+    )
+    catalog_changed("products")
+    return summary
+
+@api_router.post("/blogs/bulk")
+async def bulk_import_blogs(request: Request):
+    summary = await bulk_upsert(
+        db.blogs, request.stream(), bulk_builder(BlogCreate, timestamped=True),
+        on_written=lambda docs: search_index.add_many("blogs", docs),
+    )
+    catalog_changed("blogs", "home")
+    return summary
+
+@api_router.post("/gallery/bulk")
+async def bulk_import_gallery(request: Request):
+    summary = await bulk_upsert(db.gallery, request.stream(), bulk_builder(GalleryImageCreate))
+    catalog_changed("gallery", "home")
+    return summary
+
+# Homepage
+BLOG_CARD_FIELDS = ["id", "title", "excerpt", "image_url", "created_at"]
+
+@api_router.get("/home")
+async def get_home(
+    request: Request,
+    blogs_limit: int = Query(3, ge=0, le=MAX_PAGE_SIZE),
+    gallery_limit: int = Query(6, ge=0, le=MAX_PAGE_SIZE),
+    faqs_limit: Optional[int] = PageLimit,
+    lang: Optional[str] = None,
+):
+    """Blog cards, gallery and FAQs for the landing page in one round-trip."""
+    lang = negotiate_language(lang, request.headers.get("accept-language"))
+    cache_key = catalog_cache.make_key(
+        "home", blogs=blogs_limit, gallery=gallery_limit, faqs=faqs_limit, lang=lang
+    )
+    payload = catalog_cache.get(cache_key)
+    if payload is None:
+        generation = catalog_cache.generation("home")
+        blog_projection = storage_fields(Blog, lang, BLOG_CARD_FIELDS)
+        gallery_projection = storage_fields(GalleryImage, lang) if lang else None
+        faq_projection = storage_fields(FAQ, lang) if lang else None
+
+        async def section(collection, sort, limit, projection):
+            if limit == 0:
+                return []
+            docs, _ = await find_page(collection, {}, sort, limit, None, projection, max_time_ms=QUERY_TIMEOUT_MS)
+            if lang is not None:
+                docs = [localize(doc, lang) for doc in docs]
+            return docs
+
+        blogs, gallery, faqs = await asyncio.gather(
+            section(catalog("blogs"), BLOG_SORT, blogs_limit, blog_projection),
+            section(catalog("gallery"), INSERTION_SORT, gallery_limit, gallery_projection),
+            section(catalog("faqs"), INSERTION_SORT, faqs_limit, faq_projection),
+        )
+        parse_legacy_dates(blogs)
+        payload = CachedPayload(dump_json({"blogs": blogs, "gallery": gallery, "faqs": faqs}, FAST_JSON))
+        catalog_cache.set(cache_key, payload, generation)
+    response = await payload_response(request, payload)
+    if request.query_params.get("lang") == "auto":
+        response.headers.add_vary_header("Accept-Language")
+    return response
+
+# Search
+REINDEX_BATCH = 500
+
+async def reindex(collection_name: str):
+    # Read from the primary so it has the latest writes. Documents are
+    # replaced in place, yielding to the event loop between batches, and
+    # those gone from Mongo are dropped last, so search keeps answering.
+    seen = set()
+    async for doc in db[collection_name].find({}, search_projection(collection_name)):
+        search_index.add(collection_name, doc)
+        seen.add(doc["id"])
+        if len(seen) % REINDEX_BATCH == 0:
+            await asyncio.sleep(0)
+    for doc_id in search_index.ids(collection_name) - seen:
+        search_index.remove(collection_name, doc_id)
+
+search_sync = IndexSync(
+    Path(os.environ.get('SEARCH_SYNC_DIR', ROOT_DIR / 'search_sync')),
+    reindex,
+    interval=float(os.environ.get('SEARCH_SYNC_INTERVAL', '5')),
+)
+
+@api_router.get("/search")
+async def search_catalog(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200),
+    types: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    lang: Optional[str] = None,
+):
+    lang = negotiate_language(lang, request.headers.get("accept-language"))
+    selected = None
+    if types:
+        selected = [name.strip() for name in types.split(",") if name.strip()]
+        unknown = [name for name in selected if name not in SEARCHABLE]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown types: {', '.join(unknown)}")
+    started = time.perf_counter()
+    results = search_index.search(q, types=selected, limit=limit)
+    took_ms = (time.perf_counter() - started) * 1000
+    if lang is not None:
+        results = [localize(result, lang) for result in results]
+    return {"query": q, "took_ms": round(took_ms, 3), "results": results}
+
+# Images
+@api_router.get("/img")
+async def get_image(
+    request: Request,
+    url: str,
+    w: int = 640,
+    fmt: str = "auto",
+):
+    resolved = negotiate_format(fmt, request.headers.get("accept"))
+    path, key = await image_proxy.variant(url, w, resolved)
+    headers = {"Cache-Control": "public, max-age=31536000, immutable", "ETag": f'"{key}"'}
+    if fmt == "auto":
+        headers["Vary"] = "Accept"
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type=FORMATS[resolved][1], headers=headers)
+
+# Metrics
+@api_router.get("/metrics")
+async def get_metrics():
+    cache = catalog_cache.stats()
+    images = image_proxy.cache.stats()
+    # Acknowledged submissions only reach Mongo when the background write
+    # succeeds, so write-behind failures must be visible here.
+    writers = {name: writer.stats() for name, writer in submission_writers.items()}
+    body = registry.render(extra_gauges={
+        "catalog_cache_entries": cache["entries"],
+        "catalog_cache_bytes": cache["bytes"],
+        "image_cache_files": images["files"],
+        "image_cache_bytes": images["bytes"],
+        "search_index_documents": len(search_index),
+        **pool_stats.totals(),
+        "submission_rate_limit_ip_keys": ip_limiter.stats()["keys"],
+        "submission_rate_limit_email_keys": email_limiter.stats()["keys"],
+        "submission_dedup_entries": submission_dedup.stats()["entries"],
+        "submission_writer_queued": [({"collection": name}, stats["queued"]) for name, stats in writers.items()],
+    }, extra_counters={
+        "catalog_cache_hits_total": cache["hits"],
+        "catalog_cache_misses_total": cache["misses"],
+        "catalog_cache_evictions_total": cache["evictions"],
+        "image_cache_hits_total": images["hits"],
+        "image_cache_misses_total": images["misses"],
+        "submission_writer_written_total": [({"collection": name}, stats["written"]) for name, stats in writers.items()],
+        "submission_writer_failed_total": [({"collection": name}, stats["failed"]) for name, stats in writers.items()],
+        "submission_writer_batches_total": [({"collection": name}, stats["batches"]) for name, stats in writers.items()],
+    })
+    return Response(content=body, media_type="text/plain; version=0.0.4")
+
+# Cache statistics
+@api_router.get("/cache/stats")
+async def get_cache_stats():
+    return catalog_cache.stats()
+
+# Health
+@api_router.get("/health/pool")
+async def get_pool_stats():
+    return {"options": client_options(), "servers": pool_stats.stats()}
+
+@api_router.get("/health/ready")
+async def get_readiness():
+    """Fails fast while Mongo is unreachable, slow or the pool is exhausted."""
+    if pool_stats.saturated():
+        return JSONResponse({"status": "unavailable", "reason": "connection pool exhausted"}, status_code=503)
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(db.command("ping"), READY_TIMEOUT)
+    except (asyncio.TimeoutError, ConnectionFailure) as exc:
+        reason = "ping timed out" if isinstance(exc, asyncio.TimeoutError) else str(exc)
+        return JSONResponse({"status": "unavailable", "reason": reason}, status_code=503)
+    return {"status": "ready", "ping_ms": round((time.perf_counter() - started) * 1000, 3)}
+
+# Submissions
+async def store_submission(collection_name: str, doc: dict):
+    writer = submission_writers.get(collection_name)
+    if writer is not None:
+        await writer.submit(doc)
+    else:
+        await db[collection_name].insert_one(doc)
+
+def check_submission_rate(request: Request, endpoint: str, email: str):
+    checks = (
+        (ip_limiter, "ip", request.client.host if request.client else "unknown"),
+        (email_limiter, "email", email.strip().lower()),
+    )
+    # Both buckets are checked before either is charged, so a submission
+    # rejected for its email doesn't also use up a token of the client's IP
+    now = time.monotonic()
+    for limiter, reason, key in checks:
+        allowed, retry_after = limiter.check(key, now)
+        if not allowed:
+            registry.inc("submissions_rejected_total", endpoint=endpoint, reason=reason)
+            raise HTTPException(
+                status_code=429,
+                detail="Too many submissions, please try again later",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+    for limiter, _, key in checks:
+        limiter.take(key, now)
+
+async def accept_submission(
+    request: Request, endpoint: str, submission: BaseModel, model: Type[BaseModel], collection_name: str
+):
     submission_dict = submission.model_dump()
-    submission_obj = ContactSubmission(**submission_dict)
-    doc = submission_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    await db.contact_submissions.insert_one(doc)
+    digest = content_hash(endpoint, submission_dict, sorted(submission_dict))
+    duplicate = submission_dedup.get(digest)
+    if duplicate is not None:
+        registry.inc("submissions_rejected_total", endpoint=endpoint, reason="duplicate")
+        return duplicate
+    check_submission_rate(request, endpoint, submission_dict["email"])
+    submission_obj = model(**submission_dict)
+    # Recorded before the write so concurrent repeats are caught too
+    submission_dedup.add(digest, submission_obj)
+    try:
+        await store_submission(collection_name, submission_obj.model_dump())
+    except Exception:
+        submission_dedup.discard(digest)
+        raise
     return submission_obj
 
+# Contact
+@api_router.post("/contact", response_model=ContactSubmission)
+async def submit_contact(request: Request, submission: ContactSubmissionCreate):
+    return await accept_submission(request, "contact", submission, ContactSubmission, "contact_submissions")
+
 # Product Inquiry
 @api_router.post("/inquiry", response_model=InquirySubmission)
-async def submit_inquiry(submission: InquirySubmissionCreate):
-    submission_dict = submission.model_dump()
-    submission_obj = InquirySubmission(**submission_dict)
-    doc = submission_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    await db.inquiry_submissions.insert_one(doc)
-    return submission_obj
+async def submit_inquiry(request: Request, submission: InquirySubmissionCreate):
+    return await accept_submission(request, "inquiry", submission, InquirySubmission, "inquiry_submissions")
 
 # Include the router
 app.include_router(api_router)
@@ -246,14 +810,89 @@ app.add_middleware(
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
+if COMPRESSION:
+    app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
+
+# Mongo timeouts surface as 503s so clients and load balancers can back off
+# instead of waiting on a generic 500.
+@app.exception_handler(ExecutionTimeout)
+@app.exception_handler(ConnectionFailure)
+async def mongo_unavailable(request: Request, exc: Exception):
+    logger.warning("Mongo unavailable for %s: %s", request.url.path, exc)
+    return JSONResponse({"detail": "Database unavailable"}, status_code=503, headers={"Retry-After": "1"})
+
+SERVER_TIMING = os.environ.get('SERVER_TIMING', 'false').lower() in ('1', 'true', 'yes')
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    stats = RequestStats()
+    token = current_request.set(stats)
+    registry.add_gauge("http_requests_in_flight", 1)
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        elapsed = time.perf_counter() - started
+        registry.add_gauge("http_requests_in_flight", -1)
+        current_request.reset(token)
+        route = route_label(request.scope)
+        registry.inc("http_requests_total", route=route, method=request.method, status=str(status))
+        registry.observe("http_request_duration_seconds", elapsed, route=route, method=request.method)
+        registry.observe("http_request_mongo_queries", stats.queries, route=route)
+        registry.observe("http_request_mongo_seconds", stats.mongo_seconds, route=route)
+        registry.observe("http_request_mongo_documents", stats.documents, route=route)
+    if SERVER_TIMING:
+        response.headers["Server-Timing"] = server_timing(elapsed, stats)
+    return response
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def create_indexes():
+    await ensure_indexes(db)
+
+@app.on_event("startup")
+async def build_search_index():
+    started = time.time()
+    for collection_name in SEARCHABLE:
+        await reindex(collection_name)
+    logger.info("Search index built with %d documents", len(search_index))
+    search_sync.start(started)
+
+@app.on_event("startup")
+async def start_snapshot_exporter():
+    if snapshot_exporter is not None:
+        snapshot_exporter.start()
+
+@app.on_event("startup")
+async def start_submission_writers():
+    if not SUBMISSION_WRITE_BEHIND:
+        return
+    for collection_name in ("contact_submissions", "inquiry_submissions"):
+        writer = BatchWriter(
+            db[collection_name],
+            max_batch=int(os.environ.get('SUBMISSION_BATCH_SIZE', '100')),
+            max_delay=float(os.environ.get('SUBMISSION_BATCH_DELAY', '0.5')),
+            max_queue=int(os.environ.get('SUBMISSION_QUEUE_SIZE', '10000')),
+        )
+        writer.start()
+        submission_writers[collection_name] = writer
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    for writer in submission_writers.values():
+        await writer.stop()
+    submission_writers.clear()
+    if snapshot_exporter is not None:
+        await snapshot_exporter.stop()
+    await search_sync.stop()
     client.close()
\ No newline at end of file
@@ -3,6 +3,10 @@ import { motion, AnimatePresence } from 'framer-motion';
 import { ChevronLeft, ChevronRight } from 'lucide-react';
 import { useLanguage } from '../contexts/LanguageContext';
 import { getTranslation } from '../utils/translations';
+import { imageSrcSet, proxiedImage } from '../lib/utils';
+
+// Full-bleed, so it needs larger variants than the default srcset widths
+const HERO_WIDTHS = [640, 960, 1280, 1920];
 
 const HeroSlider = () => {
   const [currentSlide, setCurrentSlide] = useState(0);
@@ -57,10 +61,14 @@ const HeroSlider = () => {
           transition={{ duration: 0.7 }}
           className="absolute inset-0"
         >
-          <div
-            className="absolute inset-0 bg-cover bg-center"
-            style={{ backgroundImage: `url(${slides[currentSlide].image})` }}
-          >
+          <div className="absolute inset-0">
+            <img
+              src={proxiedImage(slides[currentSlide].image, 1280)}
+              srcSet={imageSrcSet(slides[currentSlide].image, HERO_WIDTHS)}
+              sizes="100vw"
+              alt=""
+              className="absolute inset-0 w-full h-full object-cover object-center"
+            />
             <div className="absolute inset-0 bg-black/40" />
           </div>
 
@@ -2,6 +2,7 @@ import React from 'react';
 import { motion } from 'framer-motion';
 import { useLanguage } from '../contexts/LanguageContext';
 import { getTranslation } from '../utils/translations';
+import { imageSrcSet, proxiedImage } from '../lib/utils';
 
 const ProductCard = ({ title, image, items }) => {
   const { language } = useLanguage();
@@ -16,7 +17,10 @@ const ProductCard = ({ title, image, items }) => {
     >
       <div className="aspect-square overflow-hidden">
         <img
-          src={image}
+          src={proxiedImage(image, 640)}
+          srcSet={imageSrcSet(image)}
+          sizes="(min-width: 768px) 33vw, 100vw"
+          loading="lazy"
           alt={title}
           className="w-full h-full object-cover transform group-hover:scale-105 transition-transform duration-300"
         />
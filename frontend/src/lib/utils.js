@@ -4,3 +4,17 @@ import { twMerge } from "tailwind-merge"
 export function cn(...inputs) {
   return twMerge(clsx(inputs));
 }
+
+const IMAGE_API = `${process.env.REACT_APP_BACKEND_URL}/api/img`;
+const SRCSET_WIDTHS = [320, 640, 960, 1280];
+
+// Resized/re-encoded variant of a remote image served by the backend proxy.
+export function proxiedImage(url, width = 640) {
+  if (!/^https?:\/\//.test(url || '')) return url;
+  return `${IMAGE_API}?url=${encodeURIComponent(url)}&w=${width}&fmt=auto`;
+}
+
+export function imageSrcSet(url, widths = SRCSET_WIDTHS) {
+  if (!/^https?:\/\//.test(url || '')) return undefined;
+  return widths.map((width) => `${proxiedImage(url, width)} ${width}w`).join(', ');
+}
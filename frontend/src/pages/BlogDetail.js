@@ -31,7 +31,9 @@ const BlogDetail = () => {
 
   const fetchRelatedBlogs = async () => {
     try {
-      const response = await axios.get(`${API}/blogs`);
+      const response = await axios.get(`${API}/blogs`, {
+        params: { limit: 4, fields: 'title_en,title_fa,title_ps,image_url' },
+      });
       setRelatedBlogs(response.data.filter(b => b.id !== id).slice(0, 3));
     } catch (error) {
       console.error('Error fetching related blogs:', error);
@@ -5,6 +5,7 @@ import { X } from 'lucide-react';
 import { useLanguage } from '../contexts/LanguageContext';
 import { getTranslation } from '../utils/translations';
 import { Button } from '../components/ui/button';
+import { imageSrcSet, proxiedImage } from '../lib/utils';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
@@ -85,7 +86,10 @@ const Gallery = () => {
               data-testid={`gallery-image-${index}`}
             >
               <img
-                src={image.image_url}
+                src={proxiedImage(image.image_url, 640)}
+                srcSet={imageSrcSet(image.image_url)}
+                sizes="(min-width: 1024px) 33vw, (min-width: 640px) 50vw, 100vw"
+                loading="lazy"
                 alt={image[`alt_${language}`]}
                 className="w-full h-full object-cover hover:scale-105 transition-transform duration-300"
               />
@@ -36,35 +36,19 @@ const Home = () => {
   const [loading, setLoading] = useState(false);
 
   useEffect(() => {
-    fetchBlogs();
-    fetchGallery();
-    fetchFAQs();
+    fetchHome();
   }, []);
 
-  const fetchBlogs = async () => {
+  const fetchHome = async () => {
     try {
-      const response = await axios.get(`${API}/blogs`);
-      setBlogs(response.data.slice(0, 3));
+      const response = await axios.get(`${API}/home`, {
+        params: { blogs_limit: 3, gallery_limit: 6 },
+      });
+      setBlogs(response.data.blogs);
+      setGalleryImages(response.data.gallery);
+      setFaqs(response.data.faqs);
     } catch (error) {
-      console.error('Error fetching blogs:', error);
-    }
-  };
-
-  const fetchGallery = async () => {
-    try {
-      const response = await axios.get(`${API}/gallery`);
-      setGalleryImages(response.data.slice(0, 6));
-    } catch (error) {
-      console.error('Error fetching gallery:', error);
-    }
-  };
-
-  const fetchFAQs = async () => {
-    try {
-      const response = await axios.get(`${API}/faqs`);
-      setFaqs(response.data);
-    } catch (error) {
-      console.error('Error fetching FAQs:', error);
+      console.error('Error fetching home content:', error);
     }
   };
 
@@ -4,6 +4,7 @@ import axios from 'axios';
 import { useLanguage } from '../contexts/LanguageContext';
 import { getTranslation, translations } from '../utils/translations';
 import { Tabs, TabsList, TabsTrigger } from '../components/ui/tabs';
+import { imageSrcSet, proxiedImage } from '../lib/utils';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
@@ -109,7 +110,10 @@ const Products = () => {
             >
               <div className="aspect-square overflow-hidden">
                 <img
-                  src={getCategoryImage()}
+                  src={proxiedImage(getCategoryImage(), 640)}
+                  srcSet={imageSrcSet(getCategoryImage())}
+                  sizes="(min-width: 1280px) 25vw, (min-width: 1024px) 33vw, (min-width: 640px) 50vw, 100vw"
+                  loading="lazy"
                   alt={product}
                   className="w-full h-full object-cover group-hover:scale-105 transition-transform duration-300"
                 />
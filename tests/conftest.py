@@ -0,0 +1,24 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# The backend modules import each other as top-level modules (`from cache import ...`)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+
+@pytest.fixture
+def api(monkeypatch, tmp_path):
+    """The server module with its database swapped for an in-memory mongomock one."""
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+    os.environ.setdefault("DB_NAME", "test_database")
+    import server
+
+    monkeypatch.setattr(server, "db", mongomock_motor.AsyncMongoMockClient()["test_database"])
+    monkeypatch.setattr(server.search_sync, "directory", tmp_path / "search_sync")
+    server.catalog_cache.invalidate()
+    server.search_index.clear()
+    yield server
+    server.catalog_cache.invalidate()
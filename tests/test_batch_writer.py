@@ -0,0 +1,63 @@
+import asyncio
+
+from batch_writer import BatchWriter
+
+
+class FakeCollection:
+    name = "submissions"
+
+    def __init__(self, fail: bool = False, delay: float = 0.0):
+        self.fail = fail
+        self.delay = delay
+        self.batches = []
+
+    async def insert_many(self, docs, ordered=True):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("insert failed")
+        self.batches.append(list(docs))
+
+
+def test_stop_drains_everything_queued():
+    async def run():
+        collection = FakeCollection()
+        writer = BatchWriter(collection, max_batch=10, max_delay=60)
+        writer.start()
+        for i in range(25):
+            await writer.submit({"n": i})
+        await writer.stop()
+        return collection, writer
+
+    collection, writer = asyncio.run(run())
+    written = [doc["n"] for batch in collection.batches for doc in batch]
+    assert sorted(written) == list(range(25))
+    assert all(len(batch) <= 10 for batch in collection.batches)
+    assert writer.stats() == {"queued": 0, "written": 25, "batches": len(collection.batches), "failed": 0}
+
+
+def test_stop_writes_remainder_after_flush_timeout():
+    async def run():
+        collection = FakeCollection(delay=0.05)
+        writer = BatchWriter(collection, max_batch=2, max_delay=0)
+        writer.start()
+        for i in range(6):
+            await writer.submit({"n": i})
+        await writer.stop(timeout=0.01)
+        return collection, writer
+
+    collection, writer = asyncio.run(run())
+    assert sorted(doc["n"] for batch in collection.batches for doc in batch) == list(range(6))
+    assert writer.stats()["queued"] == 0
+
+
+def test_failed_writes_are_counted():
+    async def run():
+        writer = BatchWriter(FakeCollection(fail=True), max_batch=5, max_delay=0)
+        writer.start()
+        for i in range(3):
+            await writer.submit({"n": i})
+        await writer.stop()
+        return writer
+
+    stats = asyncio.run(run()).stats()
+    assert stats["failed"] == 3 and stats["written"] == 0
@@ -0,0 +1,35 @@
+from benchmark import compare, percentile
+
+
+def test_percentile_uses_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 100) == 100
+    assert percentile([7], 99) == 7
+    assert percentile([3, 1, 2], 0) == 1
+
+
+def report(p95, rps, rss=100.0, config=None):
+    return {
+        "config": config or {"products": 1000},
+        "routes": {"products": {"p95_ms": p95, "rps": rps}},
+        "max_rss_mb": rss,
+    }
+
+
+def test_compare_flags_only_regressions_beyond_tolerance():
+    baseline = report(p95=10.0, rps=1000.0)
+    assert compare(report(p95=10.9, rps=910.0, rss=109.0), baseline, 0.1) == []
+    assert compare(report(p95=5.0, rps=5000.0), baseline, 0.1) == []
+    assert compare(report(p95=11.5, rps=850.0, rss=120.0), baseline, 0.1) == [
+        "products: p95 10.0ms -> 11.5ms",
+        "products: rps 1000.0 -> 850.0",
+        "max RSS 100.0MB -> 120.0MB",
+    ]
+
+
+def test_compare_ignores_routes_missing_from_the_baseline(capsys):
+    baseline = {"config": {"products": 10}, "routes": {}}
+    assert compare(report(p95=99.0, rps=1.0), baseline, 0.1) == []
+    assert "different configuration" in capsys.readouterr().out
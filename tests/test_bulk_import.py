@@ -0,0 +1,80 @@
+import asyncio
+
+from pydantic import BaseModel
+from pymongo.errors import BulkWriteError
+
+from bulk_import import bulk_upsert, iter_ndjson
+
+
+async def stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def collect(chunks, **kwargs):
+    async def run():
+        return [item async for item in iter_ndjson(stream(*chunks), **kwargs)]
+    return asyncio.run(run())
+
+
+def test_iter_ndjson_numbers_lines_across_chunk_boundaries():
+    assert collect([b'{"a"', b': 1}\n\n  \n{"b": 2}\r\n', b'{"c": 3}']) == [
+        (1, b'{"a": 1}'), (4, b'{"b": 2}\r'), (5, b'{"c": 3}'),
+    ]
+
+
+def test_iter_ndjson_skips_oversized_lines_without_buffering_them():
+    assert collect([b"short\n", b"x" * 6, b"x" * 6 + b"\nok\n", b"y" * 20], max_line_bytes=10) == [
+        (1, b"short"), (2, None), (3, b"ok"), (4, None),
+    ]
+
+
+class Item(BaseModel):
+    name: str
+
+
+def build(item):
+    return {"id": item.pop("id"), **Item(**item).model_dump()}, {}
+
+
+class FailingCollection:
+    """Rejects the writes at `fail` (indexes within a batch), like an unordered bulk_write."""
+
+    def __init__(self, fail):
+        self.fail = fail
+        self.batches = []
+
+    async def bulk_write(self, requests, ordered=True):
+        self.batches.append(len(requests))
+        raise BulkWriteError({
+            "nUpserted": len(requests) - len(self.fail), "nModified": 0, "nMatched": 0,
+            "writeErrors": [{"index": i, "errmsg": f"duplicate key {i}"} for i in self.fail],
+        })
+
+
+def test_bulk_upsert_reports_write_errors_by_input_line():
+    lines = b"\n".join([
+        b'{"id": "a", "name": "A"}',
+        b'{"id": "b"}',
+        b"",
+        b'{"id": "c", "name": "C"}',
+        b'[1]',
+        b'{"id": "d", "name": "D"}',
+    ])
+    written = []
+
+    async def run():
+        return await bulk_upsert(FailingCollection(fail=[1]), stream(lines), build, on_written=written.extend)
+
+    summary = asyncio.run(run())
+    # Line 2 fails validation and line 5 isn't an object; the batch is a, c, d
+    # and the database rejects its second write, which came from line 4
+    assert summary["errors"] == [
+        {"line": 2, "error": "name: Field required"},
+        {"line": 5, "error": "expected a JSON object"},
+        {"line": 4, "error": "duplicate key 1"},
+    ]
+    assert summary["received"] == 5
+    assert summary["upserted"] == 2
+    assert summary["failed"] == 3
+    assert [doc["id"] for doc in written] == ["a", "d"]
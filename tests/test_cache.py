@@ -0,0 +1,94 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from cache import CachedPayload, ResponseCache
+
+
+def test_etag_matching_accepts_every_encoding_of_the_same_body():
+    payload = CachedPayload(b"[1, 2, 3]")
+    gzip_tag = payload.etag_for("gzip")
+    assert gzip_tag != payload.etag and gzip_tag.startswith(payload.etag[:-1])
+    assert payload.matches(payload.etag)
+    assert payload.matches(gzip_tag)
+    assert payload.matches("W/" + payload.etag_for("br"))
+    assert payload.matches('"other", ' + gzip_tag)
+    assert payload.matches("*")
+    assert not payload.matches(None)
+    assert not payload.matches(CachedPayload(b"[1, 2]").etag)
+
+
+def test_response_cache_is_bounded_by_bytes():
+    cache = ResponseCache(max_entries=100, max_bytes=1000)
+    for i in range(5):
+        cache.set(("blogs", i), CachedPayload(b"x" * 300))
+    assert [cache.get(("blogs", i)) is not None for i in range(5)] == [False, False, True, True, True]
+    cache.set(("blogs", "huge"), CachedPayload(b"x" * 2000))
+    assert cache.get(("blogs", "huge")) is None
+    assert cache.stats()["bytes"] <= 1000
+
+
+def test_set_is_dropped_when_route_was_invalidated_during_load():
+    cache = ResponseCache()
+    key = ResponseCache.make_key("products", lang="fa")
+    generation = cache.generation("products")
+    cache.invalidate("gallery")
+    cache.set(key, CachedPayload(b"[]"), generation)
+    assert cache.get(key) is not None
+
+    generation = cache.generation("products")
+    cache.invalidate("products")
+    cache.set(key, CachedPayload(b"[1]"), generation)
+    assert cache.get(key) is None
+
+    generation = cache.generation("products")
+    cache.invalidate()
+    cache.set(key, CachedPayload(b"[2]"), generation)
+    assert cache.get(key) is None
+
+
+def test_write_during_list_load_is_not_hidden_by_the_cache(api, monkeypatch):
+    client = TestClient(api.app)
+    find_page = api.find_page
+
+    async def racing_find_page(collection, *args, **kwargs):
+        page = await find_page(collection, *args, **kwargs)
+        # A create handled while this read was in flight
+        await api.db.faqs.insert_one({"id": "new", "question_en": "q", "question_fa": "q", "question_ps": "q",
+                                      "answer_en": "a", "answer_fa": "a", "answer_ps": "a"})
+        api.catalog_changed("faqs")
+        monkeypatch.setattr(api, "find_page", find_page)
+        return page
+
+    monkeypatch.setattr(api, "find_page", racing_find_page)
+    assert client.get("/api/faqs").json() == []
+    assert [faq["id"] for faq in client.get("/api/faqs").json()] == ["new"]
+
+
+def test_list_revalidation_answers_304_until_the_list_changes(api):
+    def faq(i):
+        return {"id": f"f{i}", **{f"{field}_{lang}": f"{field} {i} " * 10
+                                  for field in ("question", "answer") for lang in ("en", "fa", "ps")}}
+
+    asyncio.run(api.db.faqs.insert_many([faq(i) for i in range(10)]))
+    client = TestClient(api.app)
+
+    first = client.get("/api/faqs", headers={"Accept-Encoding": "identity"})
+    etag = first.headers["etag"]
+    assert first.status_code == 200 and first.headers["cache-control"] == "no-cache"
+
+    cached = client.get("/api/faqs", headers={"If-None-Match": etag, "Accept-Encoding": "identity"})
+    assert cached.status_code == 304 and cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    # The gzip representation has its own ETag but revalidates against either
+    gzipped = client.get("/api/faqs", headers={"If-None-Match": etag, "Accept-Encoding": "gzip"})
+    assert gzipped.status_code == 304
+    assert gzipped.headers["etag"] == etag[:-1] + '-gzip"'
+    assert gzipped.headers["vary"] == "Accept-Encoding"
+
+    asyncio.run(api.db.faqs.insert_one(faq(10)))
+    api.catalog_changed("faqs")
+    changed = client.get("/api/faqs", headers={"If-None-Match": etag, "Accept-Encoding": "identity"})
+    assert changed.status_code == 200 and len(changed.json()) == 11
+    assert changed.headers["etag"] != etag
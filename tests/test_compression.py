@@ -0,0 +1,35 @@
+import gzip
+
+import pytest
+
+from cache import CachedPayload
+from compression import brotli, negotiate_encoding
+
+requires_brotli = pytest.mark.skipif(brotli is None, reason="brotli is not installed")
+
+
+@requires_brotli
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate, br", "br"),
+    ("br;q=0.5, gzip", "gzip"),
+    ("gzip;q=1.0, br;q=1.0", "br"),
+    ("*", "br"),
+    ("br;q=0, *;q=0.1", "gzip"),
+    ("gzip;q=0, br;q=0", None),
+    ("identity", None),
+    ("deflate", None),
+    ("", None),
+    (None, None),
+    ("gzip;q=bogus, br", "br"),
+])
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header) == expected
+
+
+def test_encoded_body_is_cached_and_decodes():
+    payload = CachedPayload(b'{"items": [' + b'"x", ' * 500 + b'"x"]}')
+    body = payload.encoded("gzip")
+    assert gzip.decompress(body) == payload.body
+    assert payload.encoded("gzip") is body
+    assert payload.encoded(None) is payload.body
+    assert payload.nbytes == len(payload.body) + len(body)
@@ -0,0 +1,81 @@
+import asyncio
+import gzip
+import json
+
+from export_snapshots import SECTIONS, SnapshotExporter, asgi_get, export, write_snapshot
+
+
+def product(i):
+    return {
+        "id": f"p{i:04d}", "category": "pickles" if i % 3 else "jams",
+        "name_en": f"Pickle {i}", "name_fa": f"ترشی {i}", "name_ps": f"ترشي {i}",
+        "description_en": None, "description_fa": None, "description_ps": None,
+        "image_url": "https://images.unsplash.com/x", "featured": False,
+    }
+
+
+def read_json(path):
+    return json.loads(path.read_bytes())
+
+
+def test_write_snapshot_writes_variants_and_skips_unchanged(tmp_path):
+    written = write_snapshot(tmp_path, "faqs.json", b"[1,2,3]", brotli_quality=1)
+    assert written[0].read_bytes() == b"[1,2,3]"
+    assert gzip.decompress(written[1].read_bytes()) == b"[1,2,3]"
+
+    mtimes = [path.stat().st_mtime_ns for path in written]
+    assert write_snapshot(tmp_path, "faqs.json", b"[1,2,3]", brotli_quality=1) == written
+    assert [path.stat().st_mtime_ns for path in written] == mtimes
+
+    write_snapshot(tmp_path, "faqs.json", b"[4]", brotli_quality=1)
+    assert gzip.decompress(written[1].read_bytes()) == b"[4]"
+
+
+def test_export_follows_cursor_past_one_page(api, tmp_path):
+    async def run():
+        await api.db.products.insert_many([product(i) for i in range(1205)])
+        await api.db.blogs.insert_one({
+            "id": "b1", "title_en": "t", "title_fa": "t", "title_ps": "t", "excerpt_en": "e",
+            "excerpt_fa": "e", "excerpt_ps": "e", "content_en": "c", "content_fa": "c", "content_ps": "c",
+            "image_url": "x", "created_at": "2024-01-01T00:00:00+00:00",
+        })
+        count = await export(api.app, tmp_path, brotli_quality=1)
+        _, _, detail = await asgi_get(api.app, "/api/products/p1204", {"lang": "fa"})
+        return count, detail
+
+    count, detail = asyncio.run(run())
+    assert count > 0
+    products = read_json(tmp_path / "products.json")
+    assert [item["id"] for item in products] == [f"p{i:04d}" for i in range(1205)]
+    assert len(read_json(tmp_path / "products.fa.json")) == 1205
+    assert len(read_json(tmp_path / "products/category/jams.json")) == 402
+    assert len(read_json(tmp_path / "products/category/pickles.ps.json")) == 803
+    assert read_json(tmp_path / "products/p1204.fa.json") == json.loads(detail)
+    assert read_json(tmp_path / "blogs/b1.json")["title_en"] == "t"
+
+
+def test_export_only_touches_the_given_sections(api, tmp_path):
+    stale_product = tmp_path / "products/gone.json"
+    stale_blog = tmp_path / "blogs/gone.json"
+    for path in (stale_product, stale_blog):
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"{}")
+
+    async def run():
+        await api.db.products.insert_one(product(1))
+        return await export(api.app, tmp_path, brotli_quality=1, sections=["products"])
+
+    asyncio.run(run())
+    assert (tmp_path / "products/p0001.json").exists()
+    assert not stale_product.exists()
+    assert stale_blog.exists()
+    assert not (tmp_path / "faqs.json").exists()
+
+
+def test_schedule_marks_only_changed_sections(tmp_path):
+    exporter = SnapshotExporter(app=None, out_dir=tmp_path)
+    assert exporter.dirty_sections() == []
+    exporter.schedule("gallery", "home", "unknown")
+    assert exporter.dirty_sections() == ["gallery", "home"]
+    exporter.schedule()
+    assert exporter.dirty_sections() == list(SECTIONS)
@@ -0,0 +1,44 @@
+import pytest
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from i18n import localize, localized_model, negotiate_language, storage_fields
+
+
+class Item(BaseModel):
+    id: str
+    category: str
+    name_en: str
+    name_fa: str
+    name_ps: str
+
+
+@pytest.mark.parametrize("lang, accept_language, expected", [
+    (None, "fa", None),
+    ("FA", None, "fa"),
+    ("auto", "fa-IR,fa;q=0.9,en;q=0.8", "fa"),
+    ("auto", "de, ps;q=0.5, en;q=0.4", "ps"),
+    ("auto", "de-DE", "en"),
+    ("auto", None, "en"),
+    ("auto", "fa;q=bogus, ps;q=0.2", "ps"),
+])
+def test_negotiate_language(lang, accept_language, expected):
+    assert negotiate_language(lang, accept_language) == expected
+
+
+def test_negotiate_language_rejects_unknown_codes():
+    with pytest.raises(HTTPException) as exc:
+        negotiate_language("de", None)
+    assert exc.value.status_code == 400
+
+
+def test_localize_keeps_only_the_requested_language():
+    doc = {"id": "1", "category": "jams", "name_en": "Jam", "name_fa": "مربا", "name_ps": "مربا"}
+    assert localize(doc, "fa") == {"id": "1", "category": "jams", "name": "مربا"}
+
+
+def test_storage_fields_maps_compact_names_to_stored_ones():
+    assert list(localized_model(Item).model_fields) == ["id", "category", "name"]
+    assert storage_fields(Item, "ps") == ["id", "category", "name_ps"]
+    assert storage_fields(Item, "en", ["name"]) == ["name_en"]
+    assert storage_fields(Item, None, ["id", "name"]) == ["id", "name_en", "name_fa", "name_ps"]
@@ -0,0 +1,125 @@
+import asyncio
+import os
+
+import pytest
+from fastapi import HTTPException
+
+import image_proxy
+from image_proxy import DiskLRUCache, ImageProxy, _download
+
+
+class FakeResponse:
+    def __init__(self, status=200, location=None, body=b""):
+        self.status_code = status
+        self.headers = {"location": location} if location else {}
+        self.body = body
+
+    @property
+    def is_redirect(self):
+        return "location" in self.headers
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, size):
+        for start in range(0, len(self.body), size):
+            yield self.body[start:start + size]
+
+
+@pytest.fixture
+def web(monkeypatch):
+    """Serves canned responses by URL and records every URL requested."""
+    pages, requested = {}, []
+
+    def get(url, **kwargs):
+        assert kwargs["allow_redirects"] is False
+        requested.append(url)
+        if url not in pages:
+            raise image_proxy.requests.ConnectionError(url)
+        return pages[url]
+
+    monkeypatch.setattr(image_proxy.requests, "get", get)
+    return pages, requested
+
+
+@pytest.fixture
+def proxy(tmp_path):
+    return ImageProxy(DiskLRUCache(tmp_path, max_bytes=1024 * 1024), allowed_hosts=["images.unsplash.com", "cdn.example"])
+
+
+def test_download_follows_redirects_between_allowed_hosts(web, proxy):
+    pages, requested = web
+    pages["https://images.unsplash.com/a"] = FakeResponse(302, location="https://cdn.example/b")
+    pages["https://cdn.example/b"] = FakeResponse(301, location="/c?w=1")
+    pages["https://cdn.example/c?w=1"] = FakeResponse(body=b"image")
+    assert _download("https://images.unsplash.com/a", proxy.check_url) == b"image"
+    assert requested == ["https://images.unsplash.com/a", "https://cdn.example/b", "https://cdn.example/c?w=1"]
+
+
+@pytest.mark.parametrize("location", [
+    "http://127.0.0.1/admin",
+    "http://169.254.169.254/latest/meta-data/",
+    "file:///etc/passwd",
+    "https://images.unsplash.com.evil.example/x",
+])
+def test_download_refuses_redirects_off_the_allowlist(web, proxy, location):
+    pages, requested = web
+    pages["https://images.unsplash.com/a"] = FakeResponse(302, location=location)
+    with pytest.raises(HTTPException) as exc:
+        _download("https://images.unsplash.com/a", proxy.check_url)
+    assert exc.value.status_code == 400
+    assert requested == ["https://images.unsplash.com/a"]
+
+
+def test_download_limits_redirect_hops_and_size(web, proxy):
+    pages, requested = web
+    pages["https://cdn.example/loop"] = FakeResponse(302, location="/loop")
+    with pytest.raises(ValueError, match="too many redirects"):
+        _download("https://cdn.example/loop", proxy.check_url)
+    assert len(requested) == image_proxy.MAX_REDIRECTS + 1
+
+    pages["https://cdn.example/huge"] = FakeResponse(body=b"x" * (image_proxy.MAX_ORIGINAL_BYTES + 1))
+    with pytest.raises(ValueError, match="too large"):
+        _download("https://cdn.example/huge", proxy.check_url)
+
+
+def test_failed_variants_do_not_leak_locks(web, proxy):
+    pages, _ = web
+    for i in range(5):
+        pages[f"https://cdn.example/broken?v={i}"] = FakeResponse(body=b"not an image")
+
+    async def run():
+        for i in range(5):
+            with pytest.raises(HTTPException) as exc:
+                await proxy.variant(f"https://cdn.example/broken?v={i}", 320, "jpeg")
+            assert exc.value.status_code == 502
+        with pytest.raises(HTTPException):
+            await proxy.variant("https://cdn.example/missing", 320, "jpeg")
+
+    asyncio.run(run())
+    assert proxy._locks == {}
+
+
+def test_disk_cache_bound_holds_across_workers_sharing_the_directory(tmp_path):
+    first = DiskLRUCache(tmp_path, max_bytes=1000)
+    second = DiskLRUCache(tmp_path, max_bytes=1000)
+    for i in range(6):
+        first.put(f"a{i}", b"x" * 100)
+        os.utime(tmp_path / f"a{i}", (i, i))
+    # The second worker has not seen the first's files until it rescans
+    second.RESCAN_SECONDS = 0
+    for i in range(6):
+        second.put(f"b{i}", b"x" * 100)
+        os.utime(tmp_path / f"b{i}", (100 + i, 100 + i))
+
+    on_disk = sorted(path.name for path in tmp_path.iterdir())
+    assert sum(path.stat().st_size for path in tmp_path.iterdir()) <= 1000
+    # Least recently used files went first, whichever worker wrote them
+    assert on_disk == ["a2", "a3", "a4", "a5", "b0", "b1", "b2", "b3", "b4", "b5"]
+    assert second.stats()["bytes"] == 1000
@@ -0,0 +1,68 @@
+import asyncio
+import base64
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from pagination import decode_cursor, encode_cursor, find_page, keyset_filter
+
+BLOG_SORT = [("created_at", -1), ("id", -1)]
+
+
+def raw_cursor(payload: bytes) -> str:
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def test_cursor_round_trip():
+    when = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    values = decode_cursor(encode_cursor([when, "abc"]), BLOG_SORT)
+    assert values[0].replace(tzinfo=timezone.utc) == when
+    assert values[1] == "abc"
+
+
+@pytest.mark.parametrize("payload", [
+    b'[{"$foo": 1}, {"$where": "sleep(1000)"}]',
+    b'[{"$gt": ""}, "x"]',
+    b'[["nested"], "x"]',
+    b'[1, "x"]',
+    b'["only-one"]',
+    b'{"created_at": 1}',
+    b"not json",
+])
+def test_decode_cursor_rejects_anything_but_sort_keys(payload):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(raw_cursor(payload), BLOG_SORT)
+    assert exc.value.status_code == 400
+
+
+def test_keyset_filter_breaks_ties_on_later_fields():
+    assert keyset_filter(BLOG_SORT, ["2024", "b"]) == {"$or": [
+        {"created_at": {"$lt": "2024"}},
+        {"created_at": "2024", "id": {"$lt": "b"}},
+    ]}
+    assert keyset_filter([("_id", 1)], ["x"]) == {"_id": {"$gt": "x"}}
+
+
+def test_pages_through_mixed_string_and_date_created_at():
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+
+    async def run():
+        collection = mongomock_motor.AsyncMongoMockClient()["test"]["blogs"]
+        newest = datetime(2024, 1, 31, tzinfo=timezone.utc)
+        docs = []
+        for day in range(7):
+            created_at = newest - timedelta(days=day)
+            # Older posts still carry the ISO strings written before the migration
+            value = created_at.replace(tzinfo=None) if day < 4 else created_at.isoformat()
+            docs.append({"id": f"b{day}", "created_at": value})
+        await collection.insert_many(docs)
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = await find_page(collection, {}, BLOG_SORT, 3, cursor, legacy_string_dates=True)
+            seen += [doc["id"] for doc in page]
+            if cursor is None:
+                return seen
+
+    assert asyncio.run(run()) == [f"b{day}" for day in range(7)]
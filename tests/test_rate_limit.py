@@ -0,0 +1,94 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from rate_limit import DuplicateFilter, TokenBucketLimiter, content_hash
+
+
+def test_token_bucket_allows_burst_then_refills():
+    limiter = TokenBucketLimiter(rate=1, burst=2)
+    assert limiter.allow("ip", now=0)[0]
+    assert limiter.allow("ip", now=0)[0]
+    allowed, retry_after = limiter.allow("ip", now=0)
+    assert not allowed and retry_after == pytest.approx(1.0)
+    assert not limiter.allow("ip", now=0.5)[0]
+    assert limiter.allow("ip", now=1.6)[0]
+    assert limiter.allow("other", now=1.6)[0]
+    assert limiter.stats()["rejected"] == 2
+
+
+def test_check_does_not_take_a_token():
+    limiter = TokenBucketLimiter(rate=1, burst=1)
+    assert limiter.check("ip", now=0) == (True, 0.0)
+    assert limiter.check("ip", now=0) == (True, 0.0)
+    limiter.take("ip", now=0)
+    assert limiter.check("ip", now=0) == (False, 1.0)
+
+
+def test_submission_rejected_by_email_keeps_the_ip_token(api, monkeypatch):
+    monkeypatch.setattr(api, "ip_limiter", TokenBucketLimiter(rate=0.001, burst=3))
+    monkeypatch.setattr(api, "email_limiter", TokenBucketLimiter(rate=0.001, burst=1))
+    client = TestClient(api.app)
+
+    def submit(email, message):
+        return client.post("/api/contact", json={"name": "n", "email": email, "message": message}).status_code
+
+    assert submit("a@x.io", "one") == 200
+    assert submit("a@x.io", "two") == 429
+    # The email rejection above must not have cost the IP a token
+    assert submit("b@x.io", "three") == 200
+    assert submit("c@x.io", "four") == 200
+    assert submit("d@x.io", "five") == 429
+
+
+def test_token_bucket_never_exceeds_burst():
+    limiter = TokenBucketLimiter(rate=1, burst=2)
+    limiter.allow("ip", now=0)
+    results = [limiter.allow("ip", now=1000)[0] for _ in range(3)]
+    assert results == [True, True, False]
+
+
+def test_token_bucket_memory_is_bounded():
+    limiter = TokenBucketLimiter(rate=1, burst=1, max_keys=3)
+    for i in range(10):
+        limiter.allow(f"ip{i}", now=0)
+    assert limiter.stats()["keys"] == 3
+    assert limiter.stats()["evictions"] == 7
+
+
+def test_token_bucket_disabled_with_zero_rate():
+    limiter = TokenBucketLimiter(rate=0, burst=0)
+    assert all(limiter.allow("ip")[0] for _ in range(100))
+
+
+def test_duplicate_filter_window_slides_on_repeats():
+    dedup = DuplicateFilter(window_seconds=10)
+    assert dedup.get("h", now=0) is None
+    dedup.add("h", "first", now=0)
+    assert dedup.get("h", now=9) == "first"
+    # The repeat at t=9 restarted the window
+    assert dedup.get("h", now=18) == "first"
+    assert dedup.get("h", now=29) is None
+    assert dedup.stats()["duplicates"] == 2
+
+
+def test_duplicate_filter_bounds_and_discard():
+    dedup = DuplicateFilter(window_seconds=60, max_entries=2)
+    for name in ("a", "b", "c"):
+        dedup.add(name, name, now=0)
+    assert dedup.get("a", now=1) is None
+    assert dedup.get("c", now=1) == "c"
+    dedup.discard("c")
+    assert dedup.get("c", now=1) is None
+
+    disabled = DuplicateFilter(window_seconds=0)
+    disabled.add("a", "a")
+    assert disabled.get("a") is None
+
+
+def test_content_hash_ignores_case_and_whitespace():
+    fields = ["email", "message"]
+    a = content_hash("contact", {"email": "A@x.io", "message": "Hello  there "}, fields)
+    b = content_hash("contact", {"email": "a@x.io", "message": "hello there"}, fields)
+    assert a == b
+    assert a != content_hash("inquiry", {"email": "a@x.io", "message": "hello there"}, fields)
+    assert a != content_hash("contact", {"email": "a@x.io", "message": "hello"}, fields)
@@ -0,0 +1,96 @@
+import asyncio
+import os
+import time
+
+from search import IndexSync, SearchIndex, normalize, tokenize
+
+ZWNJ = "‌"
+
+
+def test_zwnj_words_index_joined_form_and_parts():
+    assert tokenize(f"می{ZWNJ}کنند") == ["میکنند", "می", "کنند"]
+    assert tokenize("می کنند") == ["می", "کنند"]
+
+
+def test_arabic_variants_fold_to_persian_forms():
+    # Arabic yeh and kaf as typed on an Arabic keyboard
+    assert normalize("ترشي") == normalize("ترشی")
+    assert normalize("كباب") == normalize("کباب")
+    assert normalize("أحمد") == normalize("احمد")
+    assert normalize("خانة") == normalize("خانه")
+
+
+def test_diacritics_tatweel_and_digits_are_normalized():
+    assert normalize("مُرَبّا") == "مربا"
+    assert normalize("ترـــشی") == "ترشی"
+    assert tokenize("۱۲۳ ١٢٣ Mango") == ["123", "123", "mango"]
+
+
+def product(doc_id, **fields):
+    doc = {"id": doc_id, "category": "pickles", "image_url": "x"}
+    for base in ("name", "description"):
+        for lang in ("en", "fa", "ps"):
+            doc[f"{base}_{lang}"] = fields.get(f"{base}_{lang}", "")
+    return doc
+
+
+def test_search_matches_across_keyboard_and_zwnj_variants():
+    index = SearchIndex()
+    index.add("products", product("p1", name_fa="ترشی انبه", description_fa=f"تازه{ZWNJ}ترین"))
+    index.add("products", product("p2", name_en="Lemon jam"))
+
+    assert [hit["id"] for hit in index.search("ترشي")] == ["p1"]
+    assert [hit["id"] for hit in index.search("تازهترین")] == ["p1"]
+    assert [hit["id"] for hit in index.search("lem")] == ["p2"]
+    assert index.search("lemon", types=["blogs"]) == []
+
+
+def test_search_ranks_full_matches_first_and_tracks_changes():
+    index = SearchIndex()
+    index.add("products", product("both", name_en="mango lemon"))
+    index.add("products", product("one", name_en="mango mango"))
+    assert [hit["id"] for hit in index.search("mango lemon")] == ["both", "one"]
+
+    index.remove("products", "both")
+    assert [hit["id"] for hit in index.search("mango lemon")] == ["one"]
+    index.add("products", product("one", name_en="lemon"))
+    assert index.search("mango") == []
+
+
+def test_index_sync_ignores_own_markers(tmp_path):
+    sync = IndexSync(tmp_path, resync=None, interval=0)
+    sync.start(synced_at=time.time() - 60)
+    sync.mark("products")
+    sync.mark("gallery")
+    assert sync.stale_collections() == []
+    (tmp_path / IndexSync.MARKER.format("blogs", os.getpid() + 1)).touch()
+    assert sync.stale_collections() == ["blogs"]
+
+
+def test_index_sync_resyncs_after_another_worker_writes(tmp_path):
+    resynced = []
+
+    async def resync(collection):
+        resynced.append(collection)
+
+    async def run():
+        sync = IndexSync(tmp_path, resync, interval=0.01)
+        sync.start(synced_at=time.time() - 60)
+        (tmp_path / IndexSync.MARKER.format("faqs", os.getpid() + 1)).touch()
+        await asyncio.sleep(0.1)
+        await sync.stop()
+
+    asyncio.run(run())
+    assert resynced == ["faqs"]
+
+
+def test_reindex_replaces_changed_and_drops_deleted_documents(api):
+    async def run():
+        api.search_index.add("products", product("gone", name_en="apricot"))
+        api.search_index.add("products", product("kept", name_en="apricot"))
+        await api.db.products.insert_one(product("kept", name_en="quince"))
+        await api.reindex("products")
+
+    asyncio.run(run())
+    assert api.search_index.search("apricot") == []
+    assert [hit["id"] for hit in api.search_index.search("quince")] == ["kept"]